@@ -12,26 +12,91 @@ What it does:
 - Creates an `actual_hours` table (if missing) and loads daily actuals for reporting.
 
 Usage:
-    python scripts/load_aleut_seed.py [--excel-path "myScheduling Load.xlsx"]
+    python scripts/load_aleut_seed.py [load] [--input "myScheduling Load.xlsx"] [--bulk-mode insert|copy]
+    python scripts/load_aleut_seed.py plan [--input "myScheduling Load.xlsx"] [--incremental]
+    python scripts/load_aleut_seed.py validate "myScheduling Load.xlsx" [--reject-file rejects.csv]
+    python scripts/load_aleut_seed.py load-many exports/ [--tenant-map tenants.json] [--db-connections 2]
+    python scripts/load_aleut_seed.py convert "myScheduling Load.xlsx" [--output load.parquet]
+    python scripts/load_aleut_seed.py generate synthetic.xlsx [--employees 2000 --days 365 --manager-shape deep]
+    python scripts/load_aleut_seed.py bench [--scales 100,1000,5000] [--output bench.json]
+    python scripts/load_aleut_seed.py passwords [--tenant "Aleut Federal"] [--rounds 12] [--workers 4]
+    python scripts/load_aleut_seed.py export snapshot/ [--tenant "Aleut Federal"] [--partition month]
+    python scripts/load_aleut_seed.py startup [--repeat 5] [--output startup.json]
+    PYTHONPATH=scripts python -m load_aleut_seed ...   # same CLI from cached bytecode (faster cold start)
+    python -m pytest scripts/tests                      # build_models parity and helper checks, no database
 
 Notes:
 - Uses the connection string from backend/src/MyScheduling.Api/appsettings.Development.json.
 - Safe to re-run: upserts users/projects/wbs/assignments and de-dupes actuals by (user_id, wbs_element_id, work_date, hours).
 - Default admin password: Admin@123 (bcrypt hashed). Change `ADMIN_PASSWORD` below if desired.
+- Input may be .xlsx, .csv, .parquet or .arrow/.feather. Rows that fail validation go to `--reject-file`
+  (default `<input stem>.rejects.csv`) and the rest load.
+- Each load records a per-tenant watermark in `seed_load_watermarks`; `--incremental` loads only rows on or
+  after it. Generated emails are claimed once in `seed_employee_emails`.
+- `--help` on each command describes its options (`--stream`, `--checkpoint`, `--partition`, `--first-load`,
+  `--actuals buckets`, ...).
 """
+from __future__ import annotations  # annotations name pandas/psycopg2 types without importing them
+
 import argparse
+import bisect
+import contextlib
+import cProfile
+import csv
 import datetime as dt
+import fnmatch
+import functools
+import glob
+import hashlib
+import importlib
+import io
+import itertools
 import json
+import math
+import os
+import queue
+import random
 import re
 import sys
+import tempfile
+import threading
+import time
 import uuid
 from collections import defaultdict, Counter
+import concurrent.futures
+from dataclasses import asdict, dataclass
 from pathlib import Path
 
-import pandas as pd
-import psycopg2
-import psycopg2.extras as extras
-import bcrypt
+
+
+class _LazyModule:
+    """Stands in for a heavy module and imports it (plus submodules) on first attribute access."""
+
+    def __init__(self, name: str, *submodules: str):
+        self._name = name
+        self._submodules = submodules
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            module = importlib.import_module(self._name)
+            for submodule in self._submodules:
+                importlib.import_module(submodule)
+            self._module = module
+        return getattr(self._module, attr)
+
+
+np = _LazyModule("numpy")
+pd = _LazyModule("pandas")
+psycopg2 = _LazyModule("psycopg2", "psycopg2.extensions", "psycopg2.extras", "psycopg2.pool")
+extras = _LazyModule("psycopg2.extras")
+bcrypt = _LazyModule("bcrypt")
+HEAVY_MODULES = ("numpy", "pandas", "pyarrow", "psycopg2", "bcrypt")
+
+try:
+    import resource
+except ImportError:  # Windows; peak RSS is reported as null
+    resource = None
 
 ROOT = Path(__file__).resolve().parent.parent
 APPSETTINGS = ROOT / "backend" / "src" / "MyScheduling.Api" / "appsettings.Development.json"
@@ -40,7 +105,18 @@ DEFAULT_EXCEL = ROOT / "myScheduling Load.xlsx"
 ADMIN_EMAIL = "admin@admin.com"
 ADMIN_DISPLAY = "Platform Admin"
 ADMIN_PASSWORD = "Admin@123"  # change if needed
+EMPLOYEE_PASSWORD = "Welcome@123"  # initial password set by `passwords`; change if needed
+BCRYPT_ROUNDS = 12  # bcrypt.gensalt() default
+PASSWORD_BATCH_USERS = 500
 TENANT_NAME = "Aleut Federal"
+BULK_MODES = ("insert", "copy")
+COPY_CHUNK_ROWS = 5000
+STREAM_CHUNK_ROWS = 50000
+PIPELINE_DEPTH = 4
+
+
+class LoadError(Exception):
+    """A load cannot go ahead; `cli` prints the message and exits non-zero."""
 
 
 def parse_conn_string(conn_str: str) -> dict:
@@ -62,13 +138,16 @@ def parse_conn_string(conn_str: str) -> dict:
     }
 
 
+@functools.lru_cache(maxsize=None)
 def load_connection():
+    """The appsettings connection, read once per process (load-many and bench open many connections)."""
     with open(APPSETTINGS, "r", encoding="utf-8") as f:
         data = json.load(f)
     conn_str = data["ConnectionStrings"]["DefaultConnection"]
     return parse_conn_string(conn_str)
 
 
+@functools.lru_cache(maxsize=None)
 def slug_email(first: str, last: str) -> str:
     clean_first = re.sub(r"[^a-z0-9]+", ".", first.lower()).strip(".")
     clean_last = re.sub(r"[^a-z0-9]+", ".", last.lower()).strip(".")
@@ -76,6 +155,7 @@ def slug_email(first: str, last: str) -> str:
     return f"{base}@aleutfederal.com"
 
 
+@functools.lru_cache(maxsize=None)
 def parse_name(raw: str):
     # Format like "Last, First (id)"
     raw = (raw or "").strip()
@@ -89,18 +169,365 @@ def parse_name(raw: str):
     return parts[0], " ".join(parts[1:])
 
 
-def read_data(excel_path: Path):
-    df = pd.read_excel(excel_path, sheet_name="Data")
-    df.rename(columns=lambda c: c.strip().replace(" ", "_"), inplace=True)
+class EmailIndex:
+    """Which employee owns which generated email: first.last@ for the first claim, first.last.<emp_id>@ after."""
+
+    TAKEN = object()
+
+    def __init__(self, claims=None, taken=()):
+        self.by_emp = dict(claims or {})
+        self.owner = dict.fromkeys(taken, self.TAKEN)
+        self.owner.update((email, emp_id) for emp_id, email in self.by_emp.items())
+        self.new = {}
+
+    def resolve(self, emp_id, first: str, last: str, preferred: str = None) -> str:
+        """Email for emp_id: its earlier claim, else preferred (default first.last@) unless someone else owns it."""
+        email = self.by_emp.get(emp_id)
+        if email is None:
+            email = preferred or slug_email(first, last)
+            suffix = 1
+            while self.owner.get(email, emp_id) != emp_id:
+                # the same employee id can exist in another tenant, so the id alone may not be free either
+                email = slug_email(first, f"{last}.{emp_id}" + (f".{suffix}" if suffix > 1 else ""))
+                suffix += 1
+            self.by_emp[emp_id] = self.new[emp_id] = email
+            self.owner[email] = emp_id
+        return email
+
+
+# Text columns are read as strings from CSV so codes like "00012.001" keep their leading zeros and dots.
+TEXT_COLUMNS = (
+    "Employee_Name", "Active_Flag", "Business_Unit", "Project_ID", "Project_Name", "Pay_Type", "Pay_Type_Name",
+)
+DATE_COLUMNS = ("Hours_Date", "Hire_date", "Termination_date")
+
+
+def _column_key(name) -> str:
+    return str(name).strip().replace(" ", "_")
+
+
+def _csv_dtypes(path: Path) -> dict:
+    header = pd.read_csv(path, nrows=0).columns
+    return {c: str for c in header if _column_key(c) in TEXT_COLUMNS}
+
+
+def _read_excel(path: Path) -> pd.DataFrame:
+    return pd.read_excel(path, sheet_name="Data")
+
+
+def _read_csv(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path, dtype=_csv_dtypes(path))
+
+
+def _read_parquet(path: Path) -> pd.DataFrame:
+    return pd.read_parquet(path)
+
+
+def _read_arrow(path: Path) -> pd.DataFrame:
+    # Feather v2 is the Arrow IPC file format.
+    return pd.read_feather(path)
+
+
+INPUT_READERS = {
+    ".xlsx": _read_excel,
+    ".xlsm": _read_excel,
+    ".csv": _read_csv,
+    ".parquet": _read_parquet,
+    ".pq": _read_parquet,
+    ".arrow": _read_arrow,
+    ".feather": _read_arrow,
+    ".ipc": _read_arrow,
+}
+
+
+def _input_format(path: Path) -> str:
+    suffix = path.suffix.lower()
+    if suffix not in INPUT_READERS:
+        raise LoadError(f"Unsupported input format '{suffix}' for {path}; expected one of {', '.join(INPUT_READERS)}")
+    return suffix
+
+
+def read_data(input_path: Path, validator: "InputValidator" = None):
+    df = INPUT_READERS[_input_format(input_path)](input_path)
+    return normalize_frame(df, validator)
+
+
+def normalize_frame(df: pd.DataFrame, validator: "InputValidator" = None) -> pd.DataFrame:
+    df.rename(columns=_column_key, inplace=True)
+    if validator is not None:
+        df = validator.check(df)
     df["Hours_Date"] = pd.to_datetime(df["Hours_Date"]).dt.date
     df["Hire_date"] = pd.to_datetime(df["Hire_date"], errors="coerce").dt.date
     df["Termination_date"] = pd.to_datetime(df["Termination_date"], errors="coerce").dt.date
     return df
 
 
-def build_models(df: pd.DataFrame):
+INPUT_COLUMNS = (
+    "Employee_Id", "Employee_Name", "Manager_ID", "Active_Flag", "Business_Unit", "Hire_date", "Termination_date",
+    "Project_ID", "Project_Name", "Hours_Date", "Entered_Hours", "Pay_Type", "Pay_Type_Name",
+)
+MAX_DAILY_HOURS = 24
+# A name or hire date that disagrees with the most common one under the same Employee_Id is a keying error
+# and rejects the row; the others can legitimately change over a long history, so they are only counted
+# against the employee's first row, which build_models keeps.
+EMPLOYEE_IDENTITY_COLUMNS = ("Employee_Name", "Hire_date")
+EMPLOYEE_DRIFT_COLUMNS = ("Manager_ID", "Active_Flag", "Business_Unit", "Termination_date")
+REJECT_REASON_COLUMN = "Reject_Reason"
+
+
+def default_reject_path(input_path: Path) -> Path:
+    return input_path.with_name(f"{input_path.stem}.rejects.csv")
+
+
+def _same(have: np.ndarray, want: np.ndarray) -> np.ndarray:
+    return (have == want) | (pd.isna(have) & pd.isna(want))
+
+
+def _blank(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+        return series.isna()
+    return series.isna() | (series.astype(str).str.strip() == "")
+
+
+class InputValidator:
+    """Row-level data-quality checks before build_models; bad rows go to the reject file, the rest load.
+
+    Tallies and daily totals carry over between frames, so a streamed load runs the same checks as a whole file.
+    """
+
+    def __init__(self, reject_path: Path = None):
+        self.reject_path = reject_path
+        self.rows = 0
+        self.rejected = 0
+        self.reasons = Counter()
+        self.drift = Counter()
+        self.first = pd.DataFrame(columns=EMPLOYEE_DRIFT_COLUMNS)
+        self.tallies = {}
+        self.day_hours = pd.Series(dtype="float64")  # (Employee_Id, Hours_Date) -> hours passed so far
+        self.employees = set()
+        self.managers = set()
+        self._written = False
+
+    def check(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return df's valid rows with Employee_Id, Manager_ID, Entered_Hours and the dates coerced."""
+        missing = [c for c in INPUT_COLUMNS if c not in df.columns]
+        if missing:
+            raise LoadError(f"Input is missing required columns: {', '.join(missing)}")
+        emp = pd.to_numeric(df["Employee_Id"], errors="coerce")
+        manager = pd.to_numeric(df["Manager_ID"], errors="coerce")
+        hours = pd.to_numeric(df["Entered_Hours"], errors="coerce")
+        dates = {col: pd.to_datetime(df[col], errors="coerce") for col in DATE_COLUMNS}
+        checks = [
+            ("Employee_Id is not an integer", emp.isna() | (emp % 1 != 0)),
+            ("Employee_Name is blank", _blank(df["Employee_Name"])),
+            ("Manager_ID is not an integer", ~_blank(df["Manager_ID"]) & (manager.isna() | (manager % 1 != 0))),
+            ("Project_ID is blank", _blank(df["Project_ID"])),
+            ("Hours_Date is not a date", dates["Hours_Date"].isna()),
+            ("Hire_date is not a date", ~_blank(df["Hire_date"]) & dates["Hire_date"].isna()),
+            ("Termination_date is not a date", ~_blank(df["Termination_date"]) & dates["Termination_date"].isna()),
+            ("Entered_Hours is not a number", hours.isna()),
+            (f"Entered_Hours is outside 0-{MAX_DAILY_HOURS}", (hours < 0) | (hours > MAX_DAILY_HOURS)),
+        ]
+        bad = np.logical_or.reduce([mask.to_numpy() for _, mask in checks])
+
+        values = df[list(EMPLOYEE_IDENTITY_COLUMNS + EMPLOYEE_DRIFT_COLUMNS)].assign(
+            Manager_ID=manager, Hire_date=dates["Hire_date"], Termination_date=dates["Termination_date"]
+        )
+        values.index = emp
+        # Name and hire date against the employee's most common value (over this frame and earlier ones).
+        row_ok = ~bad
+        for col in EMPLOYEE_IDENTITY_COLUMNS:
+            expected = self._majority(col, values[col][row_ok]).reindex(emp)
+            differs = row_ok & ~_same(values[col].to_numpy(), expected.to_numpy())
+            checks.append((f"{col} differs from the employee's other rows", pd.Series(differs, index=df.index)))
+            bad |= differs
+
+        over = self._over_daily_hours(emp, dates["Hours_Date"], hours, bad)
+        checks.append((f"daily Entered_Hours total is over {MAX_DAILY_HOURS}", pd.Series(over, index=df.index)))
+        bad |= over
+
+        # Other attributes against each employee's first valid row, only counted.
+        valid = values[~bad]
+        new_first = valid.loc[~valid.index.duplicated() & ~valid.index.isin(self.first.index), list(EMPLOYEE_DRIFT_COLUMNS)]
+        self.first = pd.concat([self.first, new_first]) if len(self.first) else new_first
+        expected = self.first.reindex(emp)
+        for col in EMPLOYEE_DRIFT_COLUMNS:
+            self.drift[col] += int((~bad & ~_same(values[col].to_numpy(), expected[col].to_numpy())).sum())
+
+        self.rows += len(df)
+        if bad.any():
+            reason = np.full(len(df), "", dtype=object)
+            for label, mask in checks:
+                hit = mask.to_numpy() & bad
+                self.reasons[label] += int(hit.sum())
+                reason[hit] = reason[hit] + label + "; "
+            self._write_rejects(df.loc[bad].assign(**{REJECT_REASON_COLUMN: [r[:-2] for r in reason[bad]]}))
+            self.rejected += int(bad.sum())
+
+        keep = ~bad
+        df = df.loc[keep].copy()
+        df["Employee_Id"] = emp[keep].astype("int64")
+        df["Manager_ID"] = manager[keep]
+        df["Entered_Hours"] = hours[keep].astype("float64")
+        for col, coerced in dates.items():
+            df[col] = coerced[keep]
+        self.employees.update(df["Employee_Id"].unique().tolist())
+        self.managers.update(int(m) for m in df["Manager_ID"].dropna().unique().tolist())
+        return df
+
+    def _majority(self, col: str, values: pd.Series) -> pd.Series:
+        """Employee_Id -> the employee's most common `col` so far; a tie goes to the value seen first."""
+        seen = pd.DataFrame({"emp": values.index, "value": values.to_numpy(), "n": 1, "seen": np.arange(len(values)) + self.rows})
+        if col in self.tallies:
+            seen = pd.concat([self.tallies[col], seen], ignore_index=True)
+        tally = seen.groupby(["emp", "value"], dropna=False, sort=False, as_index=False).agg(n=("n", "sum"), seen=("seen", "min"))
+        self.tallies[col] = tally
+        best = tally.sort_values(["n", "seen"], ascending=[False, True]).drop_duplicates("emp")
+        return best.set_index("emp")["value"]
+
+    def _over_daily_hours(self, emp: pd.Series, day: pd.Series, hours: pd.Series, bad: np.ndarray) -> np.ndarray:
+        """Mask of the rows in (employee, Hours_Date) groups whose hours, with earlier frames', total over MAX_DAILY_HOURS."""
+        rows = pd.DataFrame({"emp": emp.to_numpy()[~bad], "day": day.to_numpy()[~bad], "hours": hours.to_numpy()[~bad]})
+        totals = rows.groupby(["emp", "day"])["hours"].sum()
+        if len(self.day_hours):
+            totals_so_far = totals + self.day_hours.reindex(totals.index, fill_value=0)
+        else:
+            totals_so_far = totals
+        over = totals_so_far > MAX_DAILY_HOURS + 1e-9
+        kept = totals[~over]
+        self.day_hours = pd.concat([self.day_hours, kept]).groupby(level=[0, 1]).sum() if len(self.day_hours) else kept
+        mask = np.zeros(len(emp), dtype=bool)
+        mask[~bad] = pd.MultiIndex.from_frame(rows[["emp", "day"]]).isin(totals.index[over])
+        return mask
+
+    def _write_rejects(self, rejects: pd.DataFrame):
+        if self.reject_path is None:
+            return
+        rejects.to_csv(self.reject_path, mode="a" if self._written else "w", header=not self._written, index=False)
+        self._written = True
+
+    def summary(self, name: str = None):
+        unknown_managers = self.managers - self.employees
+        print(f"Validated {self.rows} rows{f' of {name}' if name else ''}: {self.rejected} rejected", end="")
+        if self.rejected:
+            where = f" -> {self.reject_path}" if self.reject_path else ""
+            print(" (" + ", ".join(f"{label}: {n}" for label, n in self.reasons.items() if n) + f"){where}")
+        else:
+            print()
+        for col, n in self.drift.items():
+            if n:
+                print(f"  warning: {n} rows change {col} from the employee's first row (the first row is kept)")
+        if unknown_managers:
+            print(f"  warning: {len(unknown_managers)} Manager_IDs are not employees in the file (left without a manager)")
+
+
+def _excel_chunks(path: Path, chunk_rows: int):
+    import openpyxl  # already required by pd.read_excel; only the streaming path uses it directly
+
+    # Read-only mode streams the sheet XML instead of materializing every cell.
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb["Data"].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        while True:
+            batch = list(itertools.islice(rows, chunk_rows))
+            if not batch:
+                break
+            yield pd.DataFrame.from_records(batch, columns=header)
+    finally:
+        wb.close()
+
+
+def _csv_chunks(path: Path, chunk_rows: int):
+    yield from pd.read_csv(path, dtype=_csv_dtypes(path), chunksize=chunk_rows)
+
+
+def _parquet_chunks(path: Path, chunk_rows: int):
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+        yield batch.to_pandas()
+
+
+def _arrow_chunks(path: Path, chunk_rows: int):
+    import pyarrow as pa
+
+    # Memory-mapped, so only the record batch being converted is resident.
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            table = pa.Table.from_batches([reader.get_batch(i)])
+            for offset in range(0, table.num_rows, chunk_rows):
+                yield table.slice(offset, chunk_rows).to_pandas()
+
+
+CHUNK_READERS = {
+    ".xlsx": _excel_chunks,
+    ".xlsm": _excel_chunks,
+    ".csv": _csv_chunks,
+    ".parquet": _parquet_chunks,
+    ".pq": _parquet_chunks,
+    ".arrow": _arrow_chunks,
+    ".feather": _arrow_chunks,
+    ".ipc": _arrow_chunks,
+}
+
+
+def iter_data_chunks(path: Path, chunk_rows: int = STREAM_CHUNK_ROWS, validator: InputValidator = None):
+    """Yield the input (any INPUT_READERS format) as normalized frames of at most chunk_rows rows."""
+    for chunk in CHUNK_READERS[_input_format(path)](path, chunk_rows):
+        yield normalize_frame(chunk, validator)
+
+
+def validate_input(path: Path, reject_path: Path = None, stream: bool = False, chunk_rows: int = STREAM_CHUNK_ROWS):
+    """`validate`: run InputValidator over a file without touching the database; returns the validator."""
+    validator = InputValidator(reject_path or default_reject_path(path))
+    started = time.perf_counter()
+    if stream:
+        for _ in iter_data_chunks(path, chunk_rows, validator):
+            pass
+    else:
+        read_data(path, validator)
+    validator.summary(path.name)
+    print(f"Validated in {time.perf_counter() - started:.2f}s")
+    return validator
+
+
+def _columnar_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Give the raw sheet columns Arrow-friendly types without changing what build_models sees."""
+    df = df.rename(columns=_column_key)
+    for col in DATE_COLUMNS:
+        df[col] = pd.to_datetime(df[col], errors="coerce" if col != "Hours_Date" else "raise")
+    for col in df.columns:
+        if df[col].dtype == object and col not in DATE_COLUMNS:
+            df[col] = df[col].map(lambda v: v if v is None or (isinstance(v, float) and v != v) else str(v))
+    return df
+
+
+def convert_input(source: Path, output: Path, chunk_rows: int = STREAM_CHUNK_ROWS, reject_path: Path = None):
+    """Cache an export's valid rows in a columnar format (.parquet or .arrow/.feather); rejects go to a CSV."""
+    suffix = _input_format(output)
+    if INPUT_READERS[suffix] not in (_read_parquet, _read_arrow):
+        raise LoadError(f"convert writes Parquet or Arrow files, not '{suffix}'")
+    started = time.perf_counter()
+    validator = InputValidator(reject_path or default_reject_path(source))
+    df = INPUT_READERS[_input_format(source)](source).rename(columns=_column_key)
+    df = _columnar_frame(validator.check(df))
+    validator.summary(source.name)
+    parsed = time.perf_counter()
+    write_input(df, output, chunk_rows)
+    print(
+        f"Converted {len(df)} rows from {source} to {output} "
+        f"(read {parsed - started:.2f}s, write {time.perf_counter() - parsed:.2f}s)"
+    )
+
+
+def build_models_reference(df: pd.DataFrame):
+    """Row-by-row reference implementation; kept to validate build_models_vectorized against."""
     employees = {}
-    email_counts = Counter()
+    emails = EmailIndex()
     projects = {}
     wbs_map = {}
     assignments = {}
@@ -125,10 +552,7 @@ def build_models(df: pd.DataFrame):
         # Build employee
         if emp_id not in employees:
             first, last = parse_name(emp_name)
-            email = slug_email(first, last)
-            email_counts[email] += 1
-            if email_counts[email] > 1:
-                email = slug_email(first, f"{last}.{emp_id}")
+            email = emails.resolve(emp_id, first, last)
             employees[emp_id] = {
                 "first": first,
                 "last": last,
@@ -168,16 +592,20 @@ def build_models(df: pd.DataFrame):
 
         # Assignments (per employee + WBS)
         assign_key = (emp_id, proj_id_raw)
+        month = hours_date.replace(day=1)
         if assign_key not in assignments:
             assignments[assign_key] = {
                 "start": hours_date,
                 "end": hours_date,
                 "total_hours": entered_hours,
+                "monthly": {month: entered_hours},
             }
         else:
             assignments[assign_key]["start"] = min(assignments[assign_key]["start"], hours_date)
             assignments[assign_key]["end"] = max(assignments[assign_key]["end"], hours_date)
             assignments[assign_key]["total_hours"] += entered_hours
+            monthly = assignments[assign_key]["monthly"]
+            monthly[month] = monthly.get(month, 0.0) + entered_hours
 
         # Actuals (for reporting)
         actuals.append(
@@ -194,18 +622,434 @@ def build_models(df: pd.DataFrame):
             }
         )
 
+    _clear_top_manager(employees)
+    return employees, projects, wbs_map, assignments, actuals
+
+
+def _clear_top_manager(employees):
     # Make Geoff Vaughan the top manager (no manager)
     for emp_id, data in employees.items():
         if data["last"].lower().startswith("vaughan") and data["first"].lower().startswith("geoff"):
             employees[emp_id]["manager_emp_id"] = None
+
+
+ACTUAL_FRAME_COLUMNS = [
+    "emp_id", "project_code", "wbs_code", "project_name", "work_date",
+    "hours", "pay_type", "pay_type_name", "business_unit",
+]
+
+
+def _strip_str(series: pd.Series) -> pd.Series:
+    # str()+strip() per distinct value only; exports repeat a few thousand codes across millions of rows.
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    cleaned = pd.Index([str(v).strip() for v in uniques], dtype=object)
+    return pd.Series(cleaned.take(codes), index=series.index, dtype=object)
+
+
+def _date_range(frame: pd.DataFrame, keys) -> pd.DataFrame:
+    grouped = frame.groupby(keys, sort=False)["_date"].agg(start="min", end="max")
+    grouped["start"] = grouped["start"].dt.date
+    grouped["end"] = grouped["end"].dt.date
+    return grouped
+
+
+def _prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    frame = pd.DataFrame(
+        {
+            "emp_id": df["Employee_Id"].astype("int64"),
+            "wbs_code": _strip_str(df["Project_ID"]),
+            "project_name": _strip_str(df["Project_Name"]),
+            "work_date": df["Hours_Date"],
+            "_date": pd.to_datetime(df["Hours_Date"]),
+            "hours": df["Entered_Hours"].astype("float64"),
+            "pay_type": df["Pay_Type"],
+            "pay_type_name": df["Pay_Type_Name"],
+            "business_unit": df["Business_Unit"],
+        }
+    )
+    frame["project_code"] = _strip_str(frame["wbs_code"].str.split(".", n=1).str[0])
+    return frame
+
+
+def _build_employees(df: pd.DataFrame, frame: pd.DataFrame, emails: EmailIndex, known=()) -> dict:
+    """Employees first seen in this frame; attributes come from each employee's first row, like the reference loop."""
+    first_rows = df.loc[~frame["emp_id"].duplicated()]
+    emp_ids = frame.loc[first_rows.index, "emp_id"].tolist()
+    names = first_rows["Employee_Name"].tolist()
+    managers = first_rows["Manager_ID"].tolist()
+    active_flags = first_rows["Active_Flag"].tolist()
+    departments = first_rows["Business_Unit"].tolist()
+    hire_dates = first_rows["Hire_date"].tolist()
+    term_dates = first_rows["Termination_date"].tolist()
+    employees = {}
+    for i, emp_id in enumerate(emp_ids):
+        if emp_id in known:
+            continue
+        first, last = parse_name(names[i])
+        email = emails.resolve(emp_id, first, last)
+        employees[emp_id] = {
+            "first": first,
+            "last": last,
+            "display_name": f"{first} {last}".strip(),
+            "email": email,
+            "active": str(active_flags[i]).strip().upper() == "Y",
+            "department": departments[i],
+            "hire_date": hire_dates[i] if pd.notna(hire_dates[i]) else None,
+            "termination_date": term_dates[i] if pd.notna(term_dates[i]) else None,
+            "manager_emp_id": int(managers[i]) if pd.notna(managers[i]) else None,
+        }
+    return employees
+
+
+def _aggregate_ranges(frame: pd.DataFrame):
+    """Projects (first segment of the Project ID), WBS (full Project ID) and assignments (employee + WBS)."""
+    proj = _date_range(frame, "project_code")
+    proj_names = frame.drop_duplicates("project_code").set_index("project_code")["project_name"]
+    projects = {
+        code: {"program_code": code, "name": proj_names[code], "start": start, "end": end}
+        for code, start, end in zip(proj.index.tolist(), proj["start"].tolist(), proj["end"].tolist())
+    }
+
+    wbs = _date_range(frame, "wbs_code")
+    wbs_first = frame.drop_duplicates("wbs_code").set_index("wbs_code")
+    wbs_map = {
+        code: {
+            "project_code": wbs_first.at[code, "project_code"],
+            "code": code,
+            "description": wbs_first.at[code, "project_name"],
+            "start": start,
+            "end": end,
+        }
+        for code, start, end in zip(wbs.index.tolist(), wbs["start"].tolist(), wbs["end"].tolist())
+    }
+
+    keys = ["emp_id", "wbs_code"]
+    assign = _date_range(frame, keys)
+    assign["total_hours"] = frame.groupby(keys, sort=False)["hours"].sum()
+    assignments = {
+        key: {"start": start, "end": end, "total_hours": total, "monthly": {}}
+        for key, start, end, total in zip(
+            assign.index.tolist(), assign["start"].tolist(), assign["end"].tolist(), assign["total_hours"].tolist()
+        )
+    }
+    month = pd.Series(frame["_date"].to_numpy().astype("datetime64[M]"), index=frame.index, name="month")
+    monthly = frame.groupby([frame["emp_id"], frame["wbs_code"], month], sort=False)["hours"].sum()
+    for (emp_id, code, start), hours in zip(monthly.index.tolist(), monthly.tolist()):
+        assignments[(emp_id, code)]["monthly"][start.date()] = hours
+    return projects, wbs_map, assignments
+
+
+def _after(frame: pd.DataFrame, since) -> pd.DataFrame:
+    # Inclusive: a later export can add rows on the watermark date itself; rows already loaded hit ON CONFLICT.
+    return frame if since is None else frame.loc[frame["_date"] >= pd.Timestamp(since)]
+
+
+def build_models_vectorized(df: pd.DataFrame, since: dt.date = None):
+    """Same outputs as build_models_reference via groupby; actuals come back as a DataFrame.
+
+    With `since`, employees still come from every row, the rest only from rows dated on or after it.
+    """
+    frame = _prepare_frame(df)
+    employees = _build_employees(df, frame, EmailIndex())
+    _clear_top_manager(employees)
+    frame = _after(frame, since)
+    projects, wbs_map, assignments = _aggregate_ranges(frame)
+    actuals = frame[ACTUAL_FRAME_COLUMNS].reset_index(drop=True)
     return employees, projects, wbs_map, assignments, actuals
 
 
-def ensure_actual_hours_table(cur):
+def _merge_ranges(target: dict, partial: dict):
+    for key, rec in partial.items():
+        current = target.get(key)
+        if current is None:
+            target[key] = rec
+            continue
+        current["start"] = min(current["start"], rec["start"])
+        current["end"] = max(current["end"], rec["end"])
+        if "total_hours" in rec:
+            current["total_hours"] += rec["total_hours"]
+        for month, hours in rec.get("monthly", {}).items():
+            current["monthly"][month] = current["monthly"].get(month, 0.0) + hours
+
+
+class StreamingModelBuilder:
+    """Accumulates build_models outputs chunk by chunk, so memory grows with entities rather than timesheet rows."""
+
+    def __init__(self, since: dt.date = None):
+        self.since = since
+        self.employees = {}
+        self.emails = EmailIndex()
+        self.projects = {}
+        self.wbs_map = {}
+        self.assignments = {}
+        self.rows = 0
+
+    def add(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fold one chunk into the running models and return its actual rows (ACTUAL_FRAME_COLUMNS)."""
+        frame = _prepare_frame(df)
+        self.employees.update(_build_employees(df, frame, self.emails, known=self.employees))
+        frame = _after(frame, self.since)
+        projects, wbs_map, assignments = _aggregate_ranges(frame)
+        _merge_ranges(self.projects, projects)
+        _merge_ranges(self.wbs_map, wbs_map)
+        _merge_ranges(self.assignments, assignments)
+        self.rows += len(frame)
+        return frame[ACTUAL_FRAME_COLUMNS]
+
+    def results(self):
+        _clear_top_manager(self.employees)
+        return self.employees, self.projects, self.wbs_map, self.assignments
+
+
+BUILD_IMPLS = {
+    "loop": build_models_reference,
+    "vectorized": build_models_vectorized,
+}
+
+
+def build_models(df: pd.DataFrame, impl: str = "vectorized", since: dt.date = None):
+    if since is not None:
+        # Only the vectorized path knows how to keep the full roster while aggregating a delta.
+        return build_models_vectorized(df, since=since)
+    return BUILD_IMPLS[impl](df)
+
+
+def actual_records(actuals):
+    """Iterate actuals as dicts regardless of which build_models implementation produced them."""
+    if isinstance(actuals, pd.DataFrame):
+        return actuals.to_dict("records")
+    return actuals
+
+
+def compare_build_outputs(expected, actual) -> list:
+    """Return human-readable differences between two build_models results (empty when they match)."""
+    names = ("employees", "projects", "wbs_map", "assignments")
+    problems = []
+    for name, exp, act in zip(names, expected[:4], actual[:4]):
+        if exp.keys() != act.keys():
+            problems.append(f"{name}: keys differ ({len(exp.keys() - act.keys())} missing, {len(act.keys() - exp.keys())} extra)")
+            continue
+        for key, exp_rec in exp.items():
+            act_rec = act[key]
+            for field, exp_val in exp_rec.items():
+                act_val = act_rec.get(field)
+                if field == "total_hours":
+                    same = math.isclose(exp_val, act_val, rel_tol=1e-9, abs_tol=1e-9)
+                elif field == "monthly":
+                    same = exp_val.keys() == act_val.keys() and all(
+                        math.isclose(hours, act_val[month], rel_tol=1e-9, abs_tol=1e-9)
+                        for month, hours in exp_val.items()
+                    )
+                else:
+                    same = exp_val == act_val or (_is_missing(exp_val) and _is_missing(act_val))
+                if not same:
+                    problems.append(f"{name}[{key!r}].{field}: {exp_val!r} != {act_val!r}")
+    exp_actuals = actual_records(expected[4])
+    act_actuals = actual_records(actual[4])
+    if len(exp_actuals) != len(act_actuals):
+        problems.append(f"actuals: {len(exp_actuals)} rows != {len(act_actuals)} rows")
+    else:
+        for i, (exp_rec, act_rec) in enumerate(zip(exp_actuals, act_actuals)):
+            diff = [
+                f for f, v in exp_rec.items()
+                if not (v == act_rec.get(f) or (_is_missing(v) and _is_missing(act_rec.get(f))))
+            ]
+            if diff:
+                problems.append(f"actuals[{i}] fields differ: {diff}")
+    return problems
+
+
+def _is_missing(value) -> bool:
+    return value is None or (not isinstance(value, (list, dict)) and bool(pd.isna(value)))
+
+
+MANAGER_SHAPES = ("random", "balanced", "flat", "deep")
+
+
+def _synthetic_manager(e: int, shape: str, rng: random.Random, span: int = 8):
+    """Manager emp_id (as the float Excel hands back) for the e-th generated employee; NaN for the top."""
+    if e == 0:
+        return float("nan")
+    if shape == "random" and rng.random() < 0.01:
+        return float(90000 + e)  # manager outside the export (left as-is by the loader)
+    manager = {
+        "random": lambda: rng.randrange(e),
+        "balanced": lambda: (e - 1) // span,
+        "flat": lambda: 0,
+        "deep": lambda: e - 1,
+    }[shape]()
+    return float(10000 + manager)
+
+
+def synthetic_frame(
+    employees: int = 300,
+    days: int = 60,
+    seed: int = 0,
+    projects: int = None,
+    wbs_depth: int = 2,
+    manager_shape: str = "random",
+    start: dt.date = dt.date(2024, 1, 1),
+) -> pd.DataFrame:
+    """Generate a post-read_data timesheet frame with namesakes, missing managers/pay types and padded ids."""
+    rng = random.Random(seed)
+    projects = projects or max(2, employees // 20)
+    suffixes = [""]
+    for level in range(wbs_depth):
+        width = 3 if level == 0 else 2
+        suffixes = [f"{s}.{c:0{3 if level == 0 else 2}d}" for s in suffixes for c in range(width)]
+    wbs_codes = [f"{p:05d}{s}" for p in range(projects) for s in suffixes]
+    workdays = [start + dt.timedelta(days=d) for d in range(days) if (start + dt.timedelta(days=d)).weekday() < 5]
+
+    columns = defaultdict(list)
+    for e in range(employees):
+        emp_id = 10000 + e
+        active = rng.random() > 0.15
+        mine = rng.sample(wbs_codes, min(3, len(wbs_codes)))
+        base = {
+            "Employee_Id": emp_id,
+            "Employee_Name": f"Last{e % 97}, First{e % 89} ({emp_id})",
+            "Manager_ID": _synthetic_manager(e, manager_shape, rng),
+            "Active_Flag": "Y" if active else " n",
+            "Business_Unit": f"BU{e % 4}",
+            "Hire_date": start - dt.timedelta(days=rng.randrange(3000)) if rng.random() > 0.05 else pd.NaT,
+            "Termination_date": pd.NaT if active else start + dt.timedelta(days=days),
+        }
+        for day in workdays:
+            if rng.random() < 0.1:
+                continue
+            code = rng.choice(mine)
+            for col, value in base.items():
+                columns[col].append(value)
+            columns["Project_ID"].append(f" {code} " if rng.random() < 0.01 else code)
+            columns["Project_Name"].append(f"Program {code.split('.')[0]}")
+            columns["Hours_Date"].append(day)
+            columns["Entered_Hours"].append(rng.choice((8.0, 7.5, 4.0, 0.1, 2.3)))
+            columns["Pay_Type"].append("REG" if rng.random() > 0.02 else float("nan"))
+            columns["Pay_Type_Name"].append("Regular")
+    return pd.DataFrame(columns)
+
+
+def write_input(df: pd.DataFrame, output: Path, chunk_rows: int = STREAM_CHUNK_ROWS):
+    """Write a timesheet frame in any INPUT_READERS format; xlsx/csv get the sheet's spaced headers."""
+    suffix = _input_format(output)
+    reader = INPUT_READERS[suffix]
+    if reader is _read_parquet:
+        _columnar_frame(df).to_parquet(output, index=False, row_group_size=chunk_rows)
+    elif reader is _read_arrow:
+        _columnar_frame(df).to_feather(output, chunksize=chunk_rows)
+    else:
+        sheet = df.rename(columns=lambda c: str(c).replace("_", " "))
+        if reader is _read_csv:
+            sheet.to_csv(output, index=False)
+        else:
+            sheet.to_excel(output, sheet_name="Data", index=False)
+
+
+def generate_input(output: Path, chunk_rows: int = STREAM_CHUNK_ROWS, **shape) -> int:
+    """Write a synthetic export (see synthetic_frame for the shape options); returns the row count."""
+    started = time.perf_counter()
+    df = synthetic_frame(**shape)
+    write_input(df, output, chunk_rows)
+    print(f"Generated {len(df)} rows for {shape.get('employees', 300)} employees in {output} "
+          f"({time.perf_counter() - started:.2f}s)")
+    return len(df)
+
+
+def check_build_parity(df: pd.DataFrame = None) -> bool:
+    """Run both build_models implementations (on generated data unless a frame is given) and report."""
+    frames = [("input file", df)] if df is not None else [
+        (
+            f"synthetic seed={seed} employees={n} managers={shape} wbs_depth={depth}",
+            synthetic_frame(employees=n, seed=seed, manager_shape=shape, wbs_depth=depth),
+        )
+        for seed, n, shape, depth in ((0, 50, "random", 2), (1, 300, "balanced", 1), (2, 1200, "deep", 3))
+    ]
+    ok = True
+    for label, frame in frames:
+        timings = {}
+        results = {}
+        for impl, fn in BUILD_IMPLS.items():
+            started = time.perf_counter()
+            results[impl] = fn(frame)
+            timings[impl] = time.perf_counter() - started
+        problems = compare_build_outputs(results["loop"], results["vectorized"])
+        status = "OK" if not problems else f"{len(problems)} differences"
+        times = ", ".join(f"{impl} {secs:.3f}s" for impl, secs in timings.items())
+        print(f"Parity {label} ({len(frame)} rows): {status} [{times}]")
+        for problem in problems[:20]:
+            print(f"  {problem}")
+        ok = ok and not problems
+    return ok
+
+
+def resolve_manager_hierarchy(employees):
+    """Returns (manager_of, dangling, cycles); a cycle's link out of its lowest emp_id is dropped."""
+    manager_of = {}
+    dangling = {}
+    for emp_id, data in employees.items():
+        mgr_emp = data["manager_emp_id"]
+        if not mgr_emp:
+            manager_of[emp_id] = None
+        elif mgr_emp in employees:
+            manager_of[emp_id] = mgr_emp
+        else:
+            dangling[emp_id] = mgr_emp
+
+    # Every employee has at most one manager, so a walk from any node either terminates or re-enters
+    # a node from the same walk; each node is visited once overall.
+    cycles = []
+    state = {}  # emp_id -> walk number that visited it
+    for walk, start in enumerate(manager_of):
+        path = []
+        node = start
+        while node is not None and node not in state:
+            state[node] = walk
+            path.append(node)
+            node = manager_of.get(node)
+        if node is not None and state[node] == walk:
+            cycle = path[path.index(node):]
+            cycles.append(cycle)
+            manager_of[min(cycle)] = None
+    return manager_of, dangling, cycles
+
+
+def report_manager_issues(dangling, cycles, limit: int = 10):
+    if dangling:
+        sample = ", ".join(f"{emp} -> {mgr}" for emp, mgr in list(dangling.items())[:limit])
+        more = f" (+{len(dangling) - limit} more)" if len(dangling) > limit else ""
+        print(f"Warning: {len(dangling)} employees reference managers not in the file, left unchanged: {sample}{more}")
+    for cycle in cycles:
+        chain = " -> ".join(str(emp) for emp in cycle + cycle[:1])
+        print(f"Warning: manager cycle {chain}; cleared manager for {min(cycle)}")
+
+
+def ensure_actual_hours_table(cur, partition: str = None):
+    """Create actual_hours if missing, range-partitioned by work_date when partition is set."""
+    if actual_hours_is_buckets(cur):
+        raise LoadError(
+            "actual_hours in this database is the application's period-bucket table (EF ActualHours); "
+            "load with --actuals buckets - the daily table cannot share its name"
+        )
+    if partition:
+        exists = list_actual_partitions(cur) is not None
+        cur.execute("SELECT to_regclass('actual_hours') IS NOT NULL")
+        if cur.fetchone()[0] and not exists:
+            print("Note: actual_hours already exists unpartitioned; --partition only applies when the table is created")
+    # Earlier --first-load runs on a partitioned table rebuilt these as invalid parent-only indexes.
     cur.execute(
         """
+        SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = to_regclass('actual_hours') AND NOT i.indisvalid AND c.relname = ANY(%s)
+        """,
+        (list(ACTUAL_SECONDARY_INDEXES),),
+    )
+    for (name,) in cur.fetchall():
+        print(f"Note: rebuilding invalid index {name} on actual_hours")
+        cur.execute(f"DROP INDEX {name}")
+    cur.execute(
+        f"""
         CREATE TABLE IF NOT EXISTS actual_hours (
-            id uuid PRIMARY KEY,
+            id uuid {"NOT NULL" if partition else "PRIMARY KEY"},
             tenant_id uuid NOT NULL,
             user_id uuid NOT NULL,
             wbs_element_id uuid NOT NULL,
@@ -217,7 +1061,8 @@ def ensure_actual_hours_table(cur):
             project_code text,
             project_name text,
             created_at timestamptz NOT NULL DEFAULT now()
-        );
+            {", PRIMARY KEY (id, work_date)" if partition else ""}
+        ) {"PARTITION BY RANGE (work_date)" if partition else ""};
         CREATE INDEX IF NOT EXISTS idx_actual_hours_user_date ON actual_hours(user_id, work_date);
         CREATE INDEX IF NOT EXISTS idx_actual_hours_wbs_date ON actual_hours(wbs_element_id, work_date);
         CREATE UNIQUE INDEX IF NOT EXISTS ux_actual_hours_unique
@@ -226,8 +1071,352 @@ def ensure_actual_hours_table(cur):
     )
 
 
+ACTUAL_SECONDARY_INDEXES = ("idx_actual_hours_user_date", "idx_actual_hours_wbs_date", "ux_actual_hours_unique")
+INDEX_BUILD_MEMORY = "1GB"
+
+
+def defer_actual_indexes(cur) -> list:
+    """First-load mode: if actual_hours is empty, drop its secondary indexes and return their definitions.
+
+    The table stays locked until commit, so nothing sees it without its indexes and a rollback restores them.
+    """
+    cur.execute("SELECT EXISTS (SELECT 1 FROM actual_hours)")
+    if cur.fetchone()[0]:
+        return []
+    # Taken in a savepoint: if rows were committed before the lock was granted, rolling back releases it.
+    cur.execute("SAVEPOINT defer_actual_indexes")
+    cur.execute("LOCK TABLE actual_hours IN ACCESS EXCLUSIVE MODE")
+    cur.execute("SELECT EXISTS (SELECT 1 FROM actual_hours)")
+    if cur.fetchone()[0]:
+        cur.execute("ROLLBACK TO SAVEPOINT defer_actual_indexes")
+        return []
+    cur.execute("RELEASE SAVEPOINT defer_actual_indexes")
+    cur.execute(
+        "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = 'actual_hours' AND indexname = ANY(%s)",
+        (list(ACTUAL_SECONDARY_INDEXES),),
+    )
+    definitions = cur.fetchall()
+    for name, _ in definitions:
+        cur.execute(f"DROP INDEX {name}")
+    # A partitioned parent's definition reads ON ONLY, which would rebuild an invalid parent-only index.
+    return [definition.replace(" ON ONLY ", " ON ", 1) for _, definition in definitions]
+
+
+def rebuild_actual_indexes(cur, definitions):
+    """Recreate the indexes defer_actual_indexes dropped, each in one sorted pass, then ANALYZE."""
+    cur.execute("SET LOCAL maintenance_work_mem = %s", (INDEX_BUILD_MEMORY,))
+    for definition in definitions:
+        cur.execute(definition)
+    cur.execute("ANALYZE actual_hours")
+
+
+def drop_unique_duplicates(actuals) -> pd.DataFrame:
+    """Drop the actual rows ux_actual_hours_unique would reject, keeping the first."""
+    frame = actuals if isinstance(actuals, pd.DataFrame) else pd.DataFrame.from_records(actuals, columns=ACTUAL_FRAME_COLUMNS)
+    keys = frame[["emp_id", "wbs_code", "work_date", "pay_type", "pay_type_name"]].assign(
+        hours=frame["hours"].astype(float).round(2)
+    )
+    duplicate = keys.duplicated() & frame["pay_type"].notna() & frame["pay_type_name"].notna()
+    if duplicate.any():
+        print(f"  actual_hours: {int(duplicate.sum())} duplicate rows dropped before the index-free load")
+    return frame.loc[~duplicate].reset_index(drop=True)
+
+
+PARTITION_GRAINS = ("month", "year")
+READ_ONLY_TRIGGER = "actual_hours_read_only"
+
+
+@dataclass
+class ActualPartition:
+    name: str
+    start: dt.date
+    end: dt.date  # exclusive, as in FOR VALUES FROM ... TO ...
+    read_only: bool = False
+
+
+def list_actual_partitions(cur):
+    """Partitions of actual_hours ordered by start date, or None when the table is not partitioned."""
+    cur.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('actual_hours')")
+    if cur.fetchone() is None:
+        return None
+    cur.execute(
+        """
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid),
+               EXISTS (SELECT 1 FROM pg_trigger t WHERE t.tgrelid = c.oid AND t.tgname = %s)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'actual_hours'::regclass
+        """,
+        (READ_ONLY_TRIGGER,),
+    )
+    partitions = []
+    for name, bound, read_only in cur.fetchall():
+        dates = re.findall(r"'(\d{4}-\d{2}-\d{2})'", bound)
+        if len(dates) == 2:  # a DEFAULT partition has no range and is never a routing target
+            partitions.append(ActualPartition(name, *map(dt.date.fromisoformat, dates), read_only))
+    return sorted(partitions, key=lambda p: p.start)
+
+
+def _partition_periods(first: dt.date, last: dt.date, grain: str):
+    start = dt.date(first.year, first.month if grain == "month" else 1, 1)
+    while start <= last:
+        if grain == "month":
+            end = dt.date(start.year + start.month // 12, start.month % 12 + 1, 1)
+        else:
+            end = dt.date(start.year + 1, 1, 1)
+        yield start, end
+        start = end
+
+
+def ensure_actual_partitions(cur, first: dt.date, last: dt.date, grain: str = None):
+    """Create the partitions covering first..last (if actual_hours is partitioned); returns list_actual_partitions."""
+    partitions = list_actual_partitions(cur)
+    if partitions is None or first is None:
+        return partitions
+    if partitions:
+        grain = "year" if (partitions[0].end - partitions[0].start).days > 31 else "month"
+    grain = grain or "month"
+
+    def missing():
+        return [
+            (start, end) for start, end in _partition_periods(first, last, grain)
+            if not any(p.start <= start < p.end for p in partitions)
+        ]
+
+    if not missing():
+        return partitions
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext('actual_hours partitions'))")
+    partitions = list_actual_partitions(cur)  # another loader may have created some while we waited
+    created = missing()
+    for start, end in created:
+        name = f"actual_hours_p{start:%Y}" if grain == "year" else f"actual_hours_p{start:%Y_%m}"
+        cur.execute(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF actual_hours FOR VALUES FROM (%s) TO (%s)",
+            (start, end),
+        )
+    if created:
+        print(f"  actual_hours: created {len(created)} {grain}ly partitions ({created[0][0]} to {created[-1][1]})")
+    return list_actual_partitions(cur)
+
+
+def actual_span(wbs_map):
+    """(first, last) work_date of the loaded actuals; every actual row falls inside its WBS's start..end."""
+    if not wbs_map:
+        return None, None
+    return min(w["start"] for w in wbs_map.values()), max(w["end"] for w in wbs_map.values())
+
+
+def warn_read_only_rows(skipped: int):
+    if skipped:
+        print(f"Warning: {skipped} actual rows fall in read-only partitions and were not loaded")
+
+
+def freeze_actual_partitions(cur, before: dt.date, thaw: bool = False) -> list:
+    """Make every partition ending on or before `before` read-only (or writable again with thaw).
+
+    A partition's statement triggers do not fire for statements on the parent, so writes are stopped per row.
+    """
+    partitions = list_actual_partitions(cur)
+    if partitions is None:
+        raise LoadError("actual_hours is not partitioned; create it with --partition month|year first")
+    cur.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION {READ_ONLY_TRIGGER}() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            RAISE EXCEPTION '% is read-only (closed actual_hours period)', TG_TABLE_NAME;
+        END $$;
+        """
+    )
+    changed = []
+    for p in partitions:
+        if p.end > before or (thaw and not p.read_only):
+            continue
+        cur.execute(f"DROP TRIGGER IF EXISTS {READ_ONLY_TRIGGER} ON {p.name}")
+        cur.execute(f"DROP TRIGGER IF EXISTS {READ_ONLY_TRIGGER}_truncate ON {p.name}")
+        if not thaw:
+            # recreated on already frozen partitions too, so ones frozen with a statement-only trigger get fixed
+            cur.execute(
+                f"CREATE TRIGGER {READ_ONLY_TRIGGER} BEFORE INSERT OR UPDATE OR DELETE ON {p.name} "
+                f"FOR EACH ROW EXECUTE FUNCTION {READ_ONLY_TRIGGER}()"
+            )
+            cur.execute(
+                f"CREATE TRIGGER {READ_ONLY_TRIGGER}_truncate BEFORE TRUNCATE ON {p.name} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION {READ_ONLY_TRIGGER}()"
+            )
+        if p.read_only == thaw:
+            changed.append(p.name)
+    print(f"{'Thawed' if thaw else 'Froze'} {len(changed)} partitions ending on or before {before}: {', '.join(changed) or 'none'}")
+    return changed
+
+
+def _insert_select_by_partition(cur, stage: str, insert_sql: str, select_sql: str, params, partitions) -> int:
+    """INSERT ... SELECT from a stage table straight into each writable partition the staged dates touch."""
+    if partitions is None:
+        cur.execute(f"{insert_sql} {select_sql} ON CONFLICT DO NOTHING", params)
+        return cur.rowcount
+    cur.execute(f"SELECT min(work_date), max(work_date) FROM {stage}")
+    first, last = cur.fetchone()
+    if first is None:
+        return 0
+    touched = [p for p in partitions if p.start <= last and p.end > first]
+    if len(touched) > 1:
+        cur.execute(f"CREATE INDEX ON {stage} (work_date)")
+    inserted = 0
+    skipped = 0
+    for p in touched:
+        if p.read_only:
+            cur.execute(f"SELECT count(*) FROM {stage} WHERE work_date >= %s AND work_date < %s", (p.start, p.end))
+            skipped += cur.fetchone()[0]
+            continue
+        cur.execute(
+            f"""
+            {insert_sql.replace("INSERT INTO actual_hours", f"INSERT INTO {p.name}", 1)}
+            {select_sql} WHERE s.work_date >= %s AND s.work_date < %s
+            ON CONFLICT DO NOTHING
+            """,
+            (*params, p.start, p.end),
+        )
+        inserted += cur.rowcount
+    warn_read_only_rows(skipped)
+    return inserted
+
+
+def ensure_rollup_tables(cur):
+    """Reporting aggregates of actual_hours, maintained by the loader for the keys each load touches."""
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS actual_hours_user_wbs_week (
+            tenant_id uuid NOT NULL,
+            user_id uuid NOT NULL,
+            wbs_element_id uuid NOT NULL,
+            week_start date NOT NULL,
+            hours numeric(12,2) NOT NULL,
+            entries integer NOT NULL,
+            refreshed_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (tenant_id, user_id, wbs_element_id, week_start)
+        );
+        CREATE INDEX IF NOT EXISTS idx_actual_hours_user_wbs_week_wbs
+            ON actual_hours_user_wbs_week(tenant_id, wbs_element_id, week_start);
+        CREATE TABLE IF NOT EXISTS actual_hours_project_month (
+            tenant_id uuid NOT NULL,
+            project_id uuid NOT NULL,
+            year integer NOT NULL,
+            month integer NOT NULL,
+            hours numeric(14,2) NOT NULL,
+            entries integer NOT NULL,
+            users integer NOT NULL,
+            refreshed_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (tenant_id, project_id, year, month)
+        );
+        """
+    )
+
+
+def rollup_week_keys(actuals, user_ids, wbs_ids) -> set:
+    """Distinct (user id, WBS id, ISO week start) keys the given actual rows fall into."""
+    if isinstance(actuals, pd.DataFrame):
+        days = pd.to_datetime(actuals["work_date"])
+        keys = pd.DataFrame(
+            {
+                "user_id": actuals["emp_id"].map(user_ids),
+                "wbs_element_id": actuals["wbs_code"].map(wbs_ids),
+                "week_start": (days - pd.to_timedelta(days.dt.dayofweek, unit="D")).dt.date,
+            }
+        ).dropna().drop_duplicates()
+        return set(zip(keys["user_id"], keys["wbs_element_id"], keys["week_start"]))
+    keys = set()
+    for rec in actuals:
+        uid = user_ids.get(rec["emp_id"])
+        wid = wbs_ids.get(rec["wbs_code"])
+        if uid and wid:
+            keys.add((uid, wid, rec["work_date"] - dt.timedelta(days=rec["work_date"].weekday())))
+    return keys
+
+
+def refresh_rollups(cur, tenant_id, week_keys=None, rebuild: bool = False):
+    """Recompute the rollup rows for the affected weeks/months from actual_hours; returns (weeks, months)."""
+    cur.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS rollup_week_keys (
+            user_id uuid, wbs_element_id uuid, week_start date, PRIMARY KEY (user_id, wbs_element_id, week_start)
+        ) ON COMMIT DROP;
+        TRUNCATE rollup_week_keys;
+        """
+    )
+    if rebuild:
+        cur.execute("DELETE FROM actual_hours_user_wbs_week WHERE tenant_id = %s", (tenant_id,))
+        cur.execute("DELETE FROM actual_hours_project_month WHERE tenant_id = %s", (tenant_id,))
+        cur.execute(
+            """
+            INSERT INTO rollup_week_keys
+            SELECT DISTINCT user_id, wbs_element_id, date_trunc('week', work_date)::date
+            FROM actual_hours WHERE tenant_id = %s
+            """,
+            (tenant_id,),
+        )
+    elif week_keys is None:
+        cur.execute(
+            """
+            INSERT INTO rollup_week_keys
+            SELECT DISTINCT u.user_id, w.wbs_element_id, date_trunc('week', s.work_date)::date
+            FROM actual_hours_raw_stage s
+            JOIN stage_user_ids u ON u.emp_id = s.emp_id
+            JOIN stage_wbs_ids w ON w.wbs_code = s.wbs_code
+            """
+        )
+    else:
+        extras.execute_values(cur, "INSERT INTO rollup_week_keys VALUES %s", list(week_keys), page_size=5000)
+    cur.execute("ANALYZE rollup_week_keys")
+
+    cur.execute(
+        """
+        INSERT INTO actual_hours_user_wbs_week AS r (tenant_id, user_id, wbs_element_id, week_start, hours, entries, refreshed_at)
+        SELECT a.tenant_id, a.user_id, a.wbs_element_id, k.week_start, sum(a.hours), count(*), now()
+        FROM rollup_week_keys k
+        JOIN actual_hours a
+          ON a.user_id = k.user_id AND a.wbs_element_id = k.wbs_element_id
+         AND a.work_date >= k.week_start AND a.work_date < k.week_start + 7
+        WHERE a.tenant_id = %s
+        GROUP BY a.tenant_id, a.user_id, a.wbs_element_id, k.week_start
+        ON CONFLICT (tenant_id, user_id, wbs_element_id, week_start) DO UPDATE SET
+            hours = EXCLUDED.hours, entries = EXCLUDED.entries, refreshed_at = EXCLUDED.refreshed_at
+        WHERE (r.hours, r.entries) IS DISTINCT FROM (EXCLUDED.hours, EXCLUDED.entries)
+        """,
+        (tenant_id,),
+    )
+    weeks = cur.rowcount
+    cur.execute(
+        """
+        WITH months AS (
+            SELECT DISTINCT w.project_id, m.month_start
+            FROM rollup_week_keys k
+            JOIN wbs_elements w ON w.id = k.wbs_element_id
+            CROSS JOIN LATERAL (
+                VALUES (date_trunc('month', k.week_start)::date), (date_trunc('month', k.week_start + 6)::date)
+            ) AS m(month_start)
+        )
+        INSERT INTO actual_hours_project_month AS r (tenant_id, project_id, year, month, hours, entries, users, refreshed_at)
+        SELECT a.tenant_id, m.project_id, extract(year FROM m.month_start)::int, extract(month FROM m.month_start)::int,
+               sum(a.hours), count(*), count(DISTINCT a.user_id), now()
+        FROM months m
+        JOIN wbs_elements w ON w.project_id = m.project_id
+        JOIN actual_hours a
+          ON a.wbs_element_id = w.id
+         AND a.work_date >= m.month_start AND a.work_date < (m.month_start + interval '1 month')::date
+        WHERE a.tenant_id = %s
+        GROUP BY a.tenant_id, m.project_id, m.month_start
+        ON CONFLICT (tenant_id, project_id, year, month) DO UPDATE SET
+            hours = EXCLUDED.hours, entries = EXCLUDED.entries, users = EXCLUDED.users,
+            refreshed_at = EXCLUDED.refreshed_at
+        WHERE (r.hours, r.entries, r.users) IS DISTINCT FROM (EXCLUDED.hours, EXCLUDED.entries, EXCLUDED.users)
+        """,
+        (tenant_id,),
+    )
+    return weeks, cur.rowcount
+
+
 def upsert_tenant(cur, tenant_name: str) -> uuid.UUID:
-    cur.execute("SELECT id FROM tenants WHERE name=%s LIMIT 1", (tenant_name,))
+    execute_prepared(cur, "seed_tenant_id", "SELECT id FROM tenants WHERE name=%s LIMIT 1", (tenant_name,))
     row = cur.fetchone()
     if row:
         return row[0]
@@ -243,8 +1432,25 @@ def upsert_tenant(cur, tenant_name: str) -> uuid.UUID:
     return tenant_id
 
 
-def upsert_user(cur, user):
-    cur.execute(
+USER_TEMPLATE = """(
+    %(id)s, %(entra)s, %(email)s, %(display)s, %(pwd)s, %(is_sys)s,
+    %(active)s, NULL, %(deactivated_at)s, NULL,
+    NULL, 0, NULL,
+    NULL, %(job_title)s, %(department)s, NULL,
+    %(org_unit)s, %(location)s, %(labor_category)s, %(cost_center)s,
+    %(type)s, %(status)s, NULL, %(tenant_id)s,
+    %(now)s, %(now)s, NULL, NULL,
+    false
+)"""
+
+
+def upsert_users(cur, users):
+    """Upsert all user payloads in batches; returns ({email: id}, number of new rows)."""
+    by_email = {u["email"]: u for u in users}
+    if not by_email:
+        return {}, 0
+    rows = extras.execute_values(
+        cur,
         """
         INSERT INTO users (
             id, entra_object_id, email, display_name, password_hash, is_system_admin,
@@ -256,16 +1462,7 @@ def upsert_user(cur, user):
             created_at, updated_at, created_by_user_id, updated_by_user_id,
             is_deleted
         )
-        VALUES (
-            %(id)s, %(entra)s, %(email)s, %(display)s, %(pwd)s, %(is_sys)s,
-            %(active)s, NULL, %(deactivated_at)s, NULL,
-            NULL, 0, NULL,
-            NULL, %(job_title)s, %(department)s, NULL,
-            %(org_unit)s, %(location)s, %(labor_category)s, %(cost_center)s,
-            %(type)s, %(status)s, NULL, %(tenant_id)s,
-            %(now)s, %(now)s, NULL, NULL,
-            false
-        )
+        VALUES %s
         ON CONFLICT (email)
         DO UPDATE SET
             display_name = EXCLUDED.display_name,
@@ -275,127 +1472,322 @@ def upsert_user(cur, user):
             org_unit = EXCLUDED.org_unit,
             tenant_id = EXCLUDED.tenant_id,
             updated_at = EXCLUDED.updated_at
-        RETURNING id;
+        RETURNING email, id, (xmax = 0);
         """,
-        user,
+        # Sorted so concurrent tenant loads that share emails take row locks in the same order.
+        sorted(by_email.values(), key=lambda u: u["email"]),
+        template=USER_TEMPLATE,
+        page_size=1000,
+        fetch=True,
     )
-    return cur.fetchone()[0]
+    # xmax is 0 only on freshly inserted row versions, which tells inserts apart from conflict updates.
+    return {email: uid for email, uid, _ in rows}, sum(1 for *_, inserted in rows if inserted)
 
 
-def upsert_membership(cur, membership):
-    cur.execute(
+def upsert_memberships(cur, memberships) -> int:
+    """Returns the number of memberships that did not exist yet."""
+    by_user = {m["user_id"]: m for m in memberships}
+    if not by_user:
+        return 0
+    rows = extras.execute_values(
+        cur,
         """
         INSERT INTO tenant_memberships (
             id, user_id, tenant_id, roles, is_active, joined_at,
             created_at, updated_at, is_deleted
         )
-        VALUES (
-            %(id)s, %(user_id)s, %(tenant_id)s, %(roles)s, %(active)s, %(joined)s,
-            %(now)s, %(now)s, false
-        )
+        VALUES %s
         ON CONFLICT (user_id, tenant_id)
-        DO UPDATE SET roles = EXCLUDED.roles, is_active = EXCLUDED.is_active, updated_at = EXCLUDED.updated_at;
+        DO UPDATE SET roles = EXCLUDED.roles, is_active = EXCLUDED.is_active, updated_at = EXCLUDED.updated_at
+        RETURNING (xmax = 0);
         """,
-        membership,
+        list(by_user.values()),
+        template="(%(id)s, %(user_id)s, %(tenant_id)s, %(roles)s, %(active)s, %(joined)s, %(now)s, %(now)s, false)",
+        page_size=1000,
+        fetch=True,
     )
+    return sum(1 for (inserted,) in rows if inserted)
 
 
-def upsert_project(cur, project, tenant_id):
-    cur.execute(
-        "SELECT id FROM projects WHERE tenant_id=%s AND program_code=%s LIMIT 1",
-        (tenant_id, project["program_code"]),
-    )
-    row = cur.fetchone()
-    if row:
-        return row[0]
-    pid = uuid.uuid4()
-    cur.execute(
+def update_managers(cur, user_ids, manager_of) -> int:
+    """Set users.manager_id for every employee in one UPDATE ... FROM (VALUES ...) join; returns rows changed."""
+    rows = [
+        (user_ids[emp_id], user_ids[mgr_emp] if mgr_emp is not None else None)
+        for emp_id, mgr_emp in manager_of.items()
+    ]
+    if not rows:
+        return 0
+    extras.execute_values(
+        cur,
         """
-        INSERT INTO projects (
-            id, tenant_id, name, program_code, customer, start_date, end_date, status,
-            created_at, updated_at, is_deleted
-        )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,false)
-        RETURNING id;
+        UPDATE users AS u
+        SET manager_id = v.manager_id
+        FROM (VALUES %s) AS v(id, manager_id)
+        WHERE u.id = v.id AND u.manager_id IS DISTINCT FROM v.manager_id
         """,
+        rows,
+        template="(%s::uuid, %s::uuid)",
+        page_size=len(rows),
+    )
+    return cur.rowcount
+
+
+def upsert_projects(cur, projects, tenant_id):
+    """Return ({program_code: id}, number inserted), inserting only codes the tenant does not already have."""
+    cur.execute(
+        "SELECT program_code, id FROM projects WHERE tenant_id=%s AND program_code = ANY(%s)",
+        (tenant_id, list(projects)),
+    )
+    project_ids = {}
+    for code, pid in cur.fetchall():
+        project_ids.setdefault(code, pid)
+    now = dt.datetime.utcnow()
+    missing = [
         (
-            pid,
+            uuid.uuid4(),
             tenant_id,
-            project["name"],
-            project["program_code"],
+            p["name"],
+            p["program_code"],
             None,
-            project["start"],
-            project["end"],
+            p["start"],
+            p["end"],
             1,  # Active
-            dt.datetime.utcnow(),
-            dt.datetime.utcnow(),
-        ),
-    )
-    return cur.fetchone()[0]
+            now,
+            now,
+        )
+        for code, p in projects.items()
+        if code not in project_ids
+    ]
+    if missing:
+        rows = extras.execute_values(
+            cur,
+            """
+            INSERT INTO projects (
+                id, tenant_id, name, program_code, customer, start_date, end_date, status,
+                created_at, updated_at, is_deleted
+            )
+            VALUES %s
+            RETURNING program_code, id;
+            """,
+            missing,
+            template="(%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,false)",
+            page_size=1000,
+            fetch=True,
+        )
+        project_ids.update(rows)
+    return project_ids, len(missing)
 
 
-def upsert_wbs(cur, wbs, tenant_id, project_id):
+def upsert_wbs_elements(cur, wbs_map, tenant_id, project_ids):
+    """Return ({wbs code: id}, number inserted), inserting only codes the tenant does not already have."""
+    stored_codes = {code: code[:100] for code in wbs_map}
     cur.execute(
-        "SELECT id FROM wbs_elements WHERE tenant_id=%s AND code=%s LIMIT 1",
-        (tenant_id, wbs["code"]),
+        "SELECT code, id FROM wbs_elements WHERE tenant_id=%s AND code = ANY(%s)",
+        (tenant_id, list(set(stored_codes.values()))),
     )
-    row = cur.fetchone()
-    if row:
-        return row[0]
-    wid = uuid.uuid4()
-    cur.execute(
-        """
-        INSERT INTO wbs_elements (
-            id, tenant_id, project_id, code, description,
-            valid_from, valid_to, start_date, end_date,
-            type, status, is_billable,
-            owner_user_id, approver_user_id, approval_status, approval_notes, approved_at,
-            owner_id, approver_id,
-            created_at, updated_at, is_deleted
-        )
-        VALUES (
-            %s,%s,%s,%s,%s,
-            %s,%s,%s,%s,
-            %s,%s,%s,
-            NULL,NULL,%s,NULL,NULL,
-            NULL,NULL,
-            %s,%s,false
-        )
-        RETURNING id;
-        """,
-        (
-            wid,
+    existing = dict(cur.fetchall())
+    now = dt.datetime.utcnow()
+    missing = {}
+    for code, w in wbs_map.items():
+        stored = stored_codes[code]
+        if stored in existing or stored in missing:
+            continue
+        missing[stored] = (
+            uuid.uuid4(),
             tenant_id,
-            project_id,
-            wbs["code"][:100],
-            wbs["description"][:500],
-            wbs["start"],
-            wbs["end"],
-            wbs["start"],
-            wbs["end"],
+            project_ids[w["project_code"]],
+            stored,
+            w["description"][:500],
+            w["start"],
+            w["end"],
+            w["start"],
+            w["end"],
             0,  # Billable
             1,  # Active
             True,
             2,  # approval_status = Approved
-            dt.datetime.utcnow(),
-            dt.datetime.utcnow(),
-        ),
+            now,
+            now,
+        )
+    if missing:
+        rows = extras.execute_values(
+            cur,
+            """
+            INSERT INTO wbs_elements (
+                id, tenant_id, project_id, code, description,
+                valid_from, valid_to, start_date, end_date,
+                type, status, is_billable,
+                owner_user_id, approver_user_id, approval_status, approval_notes, approved_at,
+                owner_id, approver_id,
+                created_at, updated_at, is_deleted
+            )
+            VALUES %s
+            RETURNING code, id;
+            """,
+            list(missing.values()),
+            template="""(
+                %s,%s,%s,%s,%s,
+                %s,%s,%s,%s,
+                %s,%s,%s,
+                NULL,NULL,%s,NULL,NULL,
+                NULL,NULL,
+                %s,%s,false
+            )""",
+            page_size=1000,
+            fetch=True,
+        )
+        existing.update(rows)
+    return {code: existing[stored] for code, stored in stored_codes.items()}, len(missing)
+
+
+HOURS_PER_WORKDAY = 8
+# A month whose allocation differs from the previous month's by this many points starts a new assignment row.
+ALLOCATION_SPLIT_POINTS = 25
+
+
+def allocation_periods(assignments) -> dict:
+    """Split each employee/WBS pair into periods of steady allocation; returns {key: [(start, end, pct), ...]}."""
+    keys = list(assignments)
+    if not keys:
+        return {}
+    counts = [len(assignments[key]["monthly"]) for key in keys]
+    pair = np.repeat(np.arange(len(keys)), counts)
+    month = np.array([m for key in keys for m in assignments[key]["monthly"]], dtype="datetime64[D]")
+    hours = np.array([h for key in keys for h in assignments[key]["monthly"].values()], dtype="float64")
+    start = np.repeat(np.array([assignments[key]["start"] for key in keys], dtype="datetime64[D]"), counts)
+    end = np.repeat(np.array([assignments[key]["end"] for key in keys], dtype="datetime64[D]"), counts)
+
+    order = np.lexsort((month, pair))
+    pair, month, hours, start, end = pair[order], month[order], hours[order], start[order], end[order]
+    month_no = month.astype("datetime64[M]")
+    first = np.maximum(month, start)
+    last = np.minimum((month_no + 1).astype("datetime64[D]") - 1, end)
+    workdays = np.busday_count(first, last + 1)
+    pct = np.minimum(100 * hours / (np.maximum(workdays, 1) * HOURS_PER_WORKDAY), 100)
+
+    new_period = np.ones(len(pair), dtype=bool)
+    new_period[1:] = (
+        (pair[1:] != pair[:-1])
+        | (month_no[1:] - month_no[:-1] != np.timedelta64(1, "M"))
+        | (np.abs(pct[1:] - pct[:-1]) >= ALLOCATION_SPLIT_POINTS)
     )
-    return cur.fetchone()[0]
+    heads = np.flatnonzero(new_period)
+    tails = np.append(heads[1:], len(pair)) - 1
+    period_hours = np.add.reduceat(hours, heads)
+    period_days = np.maximum(np.add.reduceat(workdays, heads), 1)
+    period_pct = np.clip(np.rint(100 * period_hours / (period_days * HOURS_PER_WORKDAY)), 1, 100).astype(int)
+
+    periods = defaultdict(list)
+    for p, period_start, period_end, alloc in zip(
+        pair[heads].tolist(), first[heads].tolist(), last[tails].tolist(), period_pct.tolist()
+    ):
+        periods[keys[p]].append((period_start, period_end, alloc))
+    return periods
+
+
+def _continues(end: dt.date, last_pct: int, period) -> bool:
+    """Whether period picks up in the month after end (or the same one) at about last_pct."""
+    start, _, pct = period
+    months_on = (start.year - end.year) * 12 + start.month - end.month
+    return months_on <= 1 and abs(pct - last_pct) < ALLOCATION_SPLIT_POINTS
+
+
+def split_periods(periods, existing):
+    """Decide how a pair's periods meet its existing rows; returns (periods to insert, range to widen)."""
+    if existing is None:
+        return periods, None
+    _, end, last_pct = existing
+    later = [p for p in periods if end is not None and p[0] > end]
+    if later and _continues(end, last_pct, later[0]):
+        later = later[1:]
+    rest = periods[:len(periods) - len(later)]
+    return later, (rest[0][0], rest[-1][1]) if rest else None
+
+
+EXISTING_ASSIGNMENTS_SQL = """
+    SELECT user_id, wbs_element_id, min(start_date)::date,
+           CASE WHEN bool_or(end_date IS NULL) THEN NULL ELSE max(end_date)::date END,
+           (array_agg(allocation_pct ORDER BY start_date DESC))[1]
+    FROM assignments WHERE tenant_id=%s
+    GROUP BY user_id, wbs_element_id
+"""
 
 
 def load_existing_assignments(cur, tenant_id):
-    cur.execute(
-        "SELECT user_id, wbs_element_id FROM assignments WHERE tenant_id=%s",
-        (tenant_id,),
-    )
-    return {(r[0], r[1]) for r in cur.fetchall()}
+    """{(user_id, wbs_element_id): (first start, last end, last allocation)}; end is None if any row is open."""
+    cur.execute(EXISTING_ASSIGNMENTS_SQL, (tenant_id,))
+    return {(r[0], r[1]): (r[2], r[3], r[4]) for r in cur.fetchall()}
+
+
+_PIPELINE_DONE = object()
+
+
+def prefetch(items, depth: int = PIPELINE_DEPTH):
+    """Iterate items on a background thread, at most depth ahead of the consumer."""
+    pending = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
 
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((_PIPELINE_DONE, None))
+        except BaseException as exc:
+            put((_PIPELINE_DONE, exc))
 
-def insert_assignments(cur, tenant_id, assignment_rows):
+    producer = threading.Thread(target=produce, name="seed-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item, exc = pending.get()
+            if exc is not None:
+                raise exc
+            if item is _PIPELINE_DONE:
+                return
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _values_statements(cur, sql, rows, template, page_size):
+    """Render execute_values pages to complete statements; sql has exactly one %s, for the VALUES list."""
+    template = template or "(" + ",".join(["%s"] * len(rows[0])) + ")"
+    head, tail = (part.encode() for part in sql.split("%s", 1))
+    for start in range(0, len(rows), page_size):
+        values = b",".join(cur.mogrify(template, row) for row in rows[start:start + page_size])
+        yield head + values + tail
+
+
+def execute_values_rowcount(cur, sql, rows, template=None, page_size=1000, pipeline: bool = False) -> int:
+    """execute_values that pages itself so the affected row counts of every page can be summed."""
+    total = 0
+    if pipeline and rows:
+        with cur.connection.cursor() as render_cur:
+            for statement in prefetch(_values_statements(render_cur, sql, rows, template, page_size)):
+                cur.execute(statement)
+                total += cur.rowcount
+        return total
+    for start in range(0, len(rows), page_size):
+        extras.execute_values(cur, sql, rows[start:start + page_size], template=template, page_size=page_size)
+        total += cur.rowcount
+    return total
+
+
+def insert_assignments(cur, tenant_id, assignment_rows, pipeline: bool = False) -> int:
     if not assignment_rows:
-        return
-    extras.execute_values(
+        return 0
+    return execute_values_rowcount(
         cur,
         """
         INSERT INTO assignments (
@@ -408,216 +1800,2694 @@ def insert_assignments(cur, tenant_id, assignment_rows):
         """,
         assignment_rows,
         page_size=500,
+        pipeline=pipeline,
     )
 
 
-def insert_actuals(cur, rows):
+def widen_assignments(cur, tenant_id, rows, now, pipeline: bool = False) -> int:
+    """Extend existing assignments so their date range covers newly loaded hours; open-ended ends stay open."""
     if not rows:
-        return
-    extras.execute_values(
-        cur,
+        return 0
+    # Bind the per-statement values up front; execute_values needs exactly one %s left for the VALUES list.
+    sql = cur.mogrify(
         """
-        INSERT INTO actual_hours (
-            id, tenant_id, user_id, wbs_element_id, work_date, hours,
-            pay_type, pay_type_name, business_unit, project_code, project_name, created_at
+        WITH v(user_id, wbs_element_id, start_date, end_date) AS (VALUES %%s),
+        bounds AS (
+            SELECT x.user_id, x.wbs_element_id, min(x.start_date) AS first_start, max(x.end_date) AS last_end
+            FROM assignments x JOIN v USING (user_id, wbs_element_id)
+            WHERE x.tenant_id = %s
+            GROUP BY x.user_id, x.wbs_element_id
         )
-        VALUES %s
-        ON CONFLICT DO NOTHING
+        UPDATE assignments AS a
+        SET start_date = CASE WHEN a.start_date = b.first_start THEN LEAST(a.start_date, v.start_date)
+                              ELSE a.start_date END,
+            end_date = CASE WHEN a.end_date = b.last_end THEN GREATEST(a.end_date, v.end_date)
+                            ELSE a.end_date END,
+            updated_at = %s
+        FROM v JOIN bounds b USING (user_id, wbs_element_id)
+        WHERE a.tenant_id = %s
+          AND a.user_id = v.user_id
+          AND a.wbs_element_id = v.wbs_element_id
+          AND ((a.start_date = b.first_start AND a.start_date > v.start_date)
+               OR (a.end_date = b.last_end AND a.end_date < v.end_date))
         """,
-        rows,
-        page_size=2000,
+        (tenant_id, now, tenant_id),
+    ).decode()
+    return execute_values_rowcount(
+        cur, sql, rows, template="(%s::uuid, %s::uuid, %s::date, %s::date)", page_size=5000, pipeline=pipeline
     )
 
 
-def main(excel_path: Path):
-    if not excel_path.exists():
-        sys.exit(f"Excel file not found: {excel_path}")
+ACTUAL_COLUMNS = (
+    "tenant_id", "user_id", "wbs_element_id", "work_date", "hours",
+    "pay_type", "pay_type_name", "business_unit", "project_code", "project_name",
+)
+ACTUAL_ROW_COLUMNS = ("id", *ACTUAL_COLUMNS)
+ID_MODES = ("random", "deterministic")
+# Fixed namespace so the same timesheet row gets the same id on every run and machine.
+ACTUAL_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, "actual-hours.myscheduling.aleutfederal.com")
 
-    print(f"Reading data from {excel_path} ...")
-    df = read_data(excel_path)
-    employees, projects, wbs_map, assignments, actuals = build_models(df)
 
-    print(f"Employees: {len(employees)}, Projects: {len(projects)}, WBS: {len(wbs_map)}, Assignments: {len(assignments)}, Actual rows: {len(actuals)}")
+def uuid5_strings(namespace: uuid.UUID, names) -> list:
+    """str(uuid.uuid5(namespace, name)) for each name, without building a UUID object per row (about 5x faster)."""
+    prefix = namespace.bytes
+    sha1 = hashlib.sha1
+    raw = np.frombuffer(b"".join([sha1(prefix + n.encode()).digest()[:16] for n in names]), dtype=np.uint8)
+    raw = raw.reshape(-1, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x50  # version 5
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.tobytes().hex()
+    return [f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}" for i in range(0, len(h), 32)]
 
-    conn_params = load_connection()
-    conn = psycopg2.connect(**conn_params)
-    conn.autocommit = False
-    extras.register_uuid()
-    try:
-        with conn.cursor() as cur:
-            ensure_actual_hours_table(cur)
 
-            tenant_id = upsert_tenant(cur, TENANT_NAME)
-            now = dt.datetime.utcnow()
+def assign_actual_ids(actuals, tenant_id, quiet: bool = False) -> pd.DataFrame:
+    """Columnar copy of actuals with a deterministic UUIDv5 id per natural key, exact duplicates removed."""
+    frame = actuals if isinstance(actuals, pd.DataFrame) else pd.DataFrame.from_records(actuals, columns=ACTUAL_FRAME_COLUMNS)
+    parts = [
+        frame["emp_id"].astype("int64").astype(str),
+        frame["wbs_code"].astype(str),
+        frame["work_date"].astype(str),
+        frame["hours"].astype(float).round(2).map("{:.2f}".format),
+        frame["pay_type"].astype(object).where(frame["pay_type"].notna(), "\\N").astype(str),
+        frame["pay_type_name"].astype(object).where(frame["pay_type_name"].notna(), "\\N").astype(str),
+    ]
+    keys = pd.Series(str(tenant_id), index=frame.index).str.cat(parts, sep="|")
+    unique = ~keys.duplicated()
+    frame = frame.loc[unique].reset_index(drop=True)
+    frame["id"] = uuid5_strings(ACTUAL_ID_NAMESPACE, keys[unique].tolist())
+    if not quiet and not unique.all():
+        print(f"  actual_hours: {int((~unique).sum())} duplicate rows dropped before loading")
+    return frame
 
-            # Admin user (platform + tenant admin)
-            admin_pwd_hash = bcrypt.hashpw(ADMIN_PASSWORD.encode(), bcrypt.gensalt()).decode()
-            admin_user = {
-                "id": uuid.uuid4(),
-                "entra": str(uuid.uuid4()),
-                "email": ADMIN_EMAIL,
-                "display": ADMIN_DISPLAY,
-                "pwd": admin_pwd_hash,
-                "is_sys": True,
-                "active": True,
-                "deactivated_at": None,
-                "job_title": "Platform Admin",
-                "department": "Admin",
-                "org_unit": "Admin",
-                "location": None,
-                "labor_category": None,
-                "cost_center": None,
-                "type": 0,
-                "status": 0,
-                "tenant_id": tenant_id,
-                "now": now,
-            }
-            admin_id = upsert_user(cur, admin_user)
-            upsert_membership(
-                cur,
-                {
-                    "id": uuid.uuid4(),
-                    "user_id": admin_id,
-                    "tenant_id": tenant_id,
-                    "roles": extras.Json([0, 6, 4, 5, 2, 7, 8]),  # Employee, TenantAdmin, ResourceManager, OfficeManager, ProjectManager, Executive, OverrideApprover
-                    "active": True,
-                    "joined": now,
-                    "now": now,
-                },
+
+def report_phase(label: str, rows: int, started: float):
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"  {label}: {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+
+def insert_actuals(cur, rows, partitions=None, pipeline: bool = False) -> int:
+    """Multi-row INSERT of (id, ACTUAL_COLUMNS..., created_at) rows; into each partition directly when partitioned."""
+    if not rows:
+        return 0
+    started = time.perf_counter()
+    targets = {"actual_hours": rows}
+    skipped = 0
+    if partitions is not None:
+        starts = [p.start for p in partitions]
+        targets = defaultdict(list)
+        for row in rows:
+            i = bisect.bisect_right(starts, row[4]) - 1  # row[4] is work_date
+            p = partitions[i] if i >= 0 and row[4] < partitions[i].end else None
+            if p is None or p.read_only:
+                skipped += 1
+            else:
+                targets[p.name].append(row)
+    inserted = 0
+    for table, table_rows in targets.items():
+        inserted += execute_values_rowcount(
+            cur,
+            f"""
+            INSERT INTO {table} (
+                id, tenant_id, user_id, wbs_element_id, work_date, hours,
+                pay_type, pay_type_name, business_unit, project_code, project_name, created_at
             )
+            VALUES %s
+            ON CONFLICT DO NOTHING
+            """,
+            table_rows,
+            page_size=2000,
+            pipeline=pipeline,
+        )
+    warn_read_only_rows(skipped)
+    report_phase("actual_hours insert", len(rows), started)
+    return inserted
 
-            # Build/Upsert all users
-            user_ids = {}
-            for emp_id, data in employees.items():
-                active = bool(data["active"])
-                status = 0 if active else 1
-                user_payload = {
-                    "id": uuid.uuid4(),
-                    "entra": str(uuid.uuid4()),
-                    "email": data["email"],
-                    "display": data["display_name"],
-                    "pwd": None,
-                    "is_sys": False,
-                    "active": active,
-                    "deactivated_at": data["termination_date"] if not active else None,
-                    "job_title": None,
-                    "department": data["department"],
-                    "org_unit": data["department"],
-                    "location": None,
-                    "labor_category": None,
-                    "cost_center": None,
-                    "type": 0,  # Employee
-                    "status": status,
-                    "tenant_id": tenant_id,
-                    "now": now,
-                }
-                uid = upsert_user(cur, user_payload)
-                user_ids[emp_id] = uid
-                upsert_membership(
-                    cur,
-                    {
-                        "id": uuid.uuid4(),
-                        "user_id": uid,
-                        "tenant_id": tenant_id,
-                        "roles": extras.Json([0]),  # Employee
-                        "active": active,
-                        "joined": now,
-                        "now": now,
-                    },
-                )
 
-            # Manager relationships
-            for emp_id, data in employees.items():
-                mgr_emp = data["manager_emp_id"]
-                if mgr_emp and mgr_emp in user_ids:
-                    cur.execute(
-                        "UPDATE users SET manager_id=%s WHERE id=%s",
-                        (user_ids[mgr_emp], user_ids[emp_id]),
-                    )
-                elif not mgr_emp:
-                    cur.execute(
-                        "UPDATE users SET manager_id=NULL WHERE id=%s",
-                        (user_ids[emp_id],),
-                    )
+def csv_chunks(rows, chunk_rows: int = COPY_CHUNK_ROWS):
+    """Render rows as COPY CSV text, chunk_rows at a time; yields (row count, text)."""
+    rows = iter(rows)
+    while True:
+        out = io.StringIO()
+        writer = csv.writer(out, lineterminator="\n")
+        count = 0
+        for row in itertools.islice(rows, chunk_rows):
+            writer.writerow(_copy_value(v) for v in row)
+            count += 1
+        if not count:
+            return
+        yield count, out.getvalue()
 
-            # Projects and WBS
-            project_ids = {}
-            for code, p in projects.items():
-                project_ids[code] = upsert_project(cur, p, tenant_id)
-
-            wbs_ids = {}
-            for code, w in wbs_map.items():
-                proj_id = project_ids[w["project_code"]]
-                wbs_ids[code] = upsert_wbs(cur, w, tenant_id, proj_id)
-
-            # Assignments (de-dupe against existing)
-            existing_assignments = load_existing_assignments(cur, tenant_id)
-            assignment_rows = []
-            for (emp_id, wbs_code), agg in assignments.items():
-                uid = user_ids.get(emp_id)
-                wid = wbs_ids.get(wbs_code)
-                if not uid or not wid:
-                    continue
-                if (uid, wid) in existing_assignments:
-                    continue
-                assignment_rows.append(
-                    (
-                        uuid.uuid4(),
-                        tenant_id,
-                        uid,
-                        None,  # project_role_id
-                        wid,
-                        100,  # allocation_pct
-                        agg["start"],
-                        agg["end"],
-                        3,  # Active
-                        False,
-                        None,
-                        None,
-                        now,
-                        now,
-                        False,
-                    )
-                )
-            insert_assignments(cur, tenant_id, assignment_rows)
-
-            # Actual hours
-            actual_rows = []
-            for rec in actuals:
-                uid = user_ids.get(rec["emp_id"])
-                wid = wbs_ids.get(rec["wbs_code"])
-                if not uid or not wid:
-                    continue
-                actual_rows.append(
-                    (
-                        uuid.uuid4(),
-                        tenant_id,
-                        uid,
-                        wid,
-                        rec["work_date"],
-                        rec["hours"],
-                        rec["pay_type"],
-                        rec["pay_type_name"],
-                        rec["business_unit"],
-                        rec["project_code"],
-                        rec["project_name"],
-                        now,
-                    )
-                )
-            insert_actuals(cur, actual_rows)
 
-        conn.commit()
-        print("Data load complete.")
-    except Exception as exc:
-        conn.rollback()
-        print(f"Error, rolled back: {exc}")
-        raise
-    finally:
-        conn.close()
+class _CsvStream(io.TextIOBase):
+    """Read-only file object over csv_chunks output, so COPY never needs the whole payload in memory."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+        self.rows_written = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            count, chunk = next(self._chunks, (0, ""))
+            if not chunk:
+                break
+            self.rows_written += count
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, ""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _copy_value(value):
+    # Unquoted empty fields are NULL in COPY CSV; NaN from pandas object columns means "missing" too.
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+
+def copy_rows(cur, table: str, columns, rows, pipeline: bool = False) -> int:
+    """COPY an iterable of tuples into table as CSV; returns the number of rows sent."""
+    chunks = csv_chunks(rows)
+    stream = _CsvStream(prefetch(chunks) if pipeline else chunks)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", stream)
+    return stream.rows_written
+
+
+def copy_actuals(cur, rows, partitions=None, pipeline: bool = False):
+    """COPY actual rows into a temp staging table and merge them in one statement; returns (staged, inserted)."""
+    cols = ", ".join(ACTUAL_COLUMNS)
+    cur.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS actual_hours_stage (
+            id uuid, tenant_id uuid, user_id uuid, wbs_element_id uuid, work_date date, hours numeric(10,2),
+            pay_type text, pay_type_name text, business_unit text, project_code text, project_name text
+        ) ON COMMIT DROP;
+        TRUNCATE actual_hours_stage;
+        """
+    )
+
+    started = time.perf_counter()
+    staged = copy_rows(cur, "actual_hours_stage", ACTUAL_ROW_COLUMNS, rows, pipeline)
+    report_phase("actual_hours copy to stage", staged, started)
+    if not staged:
+        return 0, 0
+
+    started = time.perf_counter()
+    inserted = _insert_select_by_partition(
+        cur,
+        "actual_hours_stage",
+        f"INSERT INTO actual_hours (id, {cols}, created_at)",
+        f"SELECT coalesce(id, gen_random_uuid()), {cols}, now() FROM actual_hours_stage s",
+        (),
+        partitions,
+    )
+    report_phase("actual_hours merge from stage", staged, started)
+    print(f"  actual_hours: {inserted} inserted, {staged - inserted} already present")
+    cur.execute("TRUNCATE actual_hours_stage")
+    return staged, inserted
+
+
+RAW_ACTUAL_COLUMNS = (
+    "id", "emp_id", "wbs_code", "work_date", "hours", "pay_type", "pay_type_name",
+    "business_unit", "project_code", "project_name",
+)
+
+
+def create_raw_actuals_stage(cur):
+    """Temp table for actual rows keyed by file ids, filled while the file is still being parsed."""
+    cur.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS actual_hours_raw_stage (
+            id uuid, emp_id bigint, wbs_code text, work_date date, hours numeric(10,2),
+            pay_type text, pay_type_name text, business_unit text, project_code text, project_name text
+        ) ON COMMIT DROP;
+        TRUNCATE actual_hours_raw_stage;
+        """
+    )
+
+
+def raw_actual_values(frame: pd.DataFrame):
+    return zip(*(frame[col].tolist() if col in frame else itertools.repeat(None) for col in RAW_ACTUAL_COLUMNS))
+
+
+def stage_raw_actuals(cur, frame: pd.DataFrame) -> int:
+    return copy_rows(cur, "actual_hours_raw_stage", RAW_ACTUAL_COLUMNS, raw_actual_values(frame))
+
+
+def merge_raw_actuals(cur, tenant_id, user_ids, wbs_ids, partitions=None) -> int:
+    """Resolve staged file ids to user/WBS ids in the database and merge into actual_hours in one statement."""
+    cur.execute(
+        """
+        CREATE TEMP TABLE IF NOT EXISTS stage_user_ids (emp_id bigint PRIMARY KEY, user_id uuid) ON COMMIT DROP;
+        CREATE TEMP TABLE IF NOT EXISTS stage_wbs_ids (wbs_code text PRIMARY KEY, wbs_element_id uuid) ON COMMIT DROP;
+        TRUNCATE stage_user_ids, stage_wbs_ids;
+        """
+    )
+    extras.execute_values(cur, "INSERT INTO stage_user_ids VALUES %s", list(user_ids.items()), page_size=5000)
+    extras.execute_values(cur, "INSERT INTO stage_wbs_ids VALUES %s", list(wbs_ids.items()), page_size=5000)
+
+    started = time.perf_counter()
+    inserted = _insert_select_by_partition(
+        cur,
+        "actual_hours_raw_stage",
+        f"INSERT INTO actual_hours (id, {', '.join(ACTUAL_COLUMNS)}, created_at)",
+        """
+        SELECT coalesce(s.id, gen_random_uuid()), %s, u.user_id, w.wbs_element_id, s.work_date, s.hours,
+               s.pay_type, s.pay_type_name, s.business_unit, s.project_code, s.project_name, now()
+        FROM actual_hours_raw_stage s
+        JOIN stage_user_ids u ON u.emp_id = s.emp_id
+        JOIN stage_wbs_ids w ON w.wbs_code = s.wbs_code
+        """,
+        (tenant_id,),
+        partitions,
+    )
+    report_phase("actual_hours merge from stage", inserted, started)
+    return inserted
+
+
+def _parsed_chunks(
+    builder: StreamingModelBuilder, path: Path, chunk_rows: int, id_tenant=None, validator: InputValidator = None
+):
+    for chunk in iter_data_chunks(path, chunk_rows, validator):
+        rows = builder.add(chunk)
+        if id_tenant is not None:
+            rows = assign_actual_ids(rows, id_tenant, quiet=True)
+        yield rows
+
+
+def stream_models(
+    cur,
+    path: Path,
+    chunk_rows: int,
+    since: dt.date = None,
+    id_tenant=None,
+    pipeline: bool = False,
+    validator: InputValidator = None,
+):
+    """Parse the file chunk by chunk, folding each chunk into the models and COPYing its actual rows to the stage."""
+    create_raw_actuals_stage(cur)
+    builder = StreamingModelBuilder(since=since)
+    started = time.perf_counter()
+    chunks = _parsed_chunks(builder, path, chunk_rows, id_tenant, validator)
+    if pipeline:
+        rows = itertools.chain.from_iterable(raw_actual_values(frame) for frame in chunks)
+        staged = copy_rows(cur, "actual_hours_raw_stage", RAW_ACTUAL_COLUMNS, rows, pipeline=True)
+    else:
+        staged = sum(stage_raw_actuals(cur, frame) for frame in chunks)
+    report_phase("parse + stage actuals", staged, started)
+    return (*builder.results(), staged)
+
+
+def iter_actual_values(actuals, tenant_id, user_ids, wbs_ids):
+    """Yield actual rows in ACTUAL_ROW_COLUMNS order, skipping any whose user or WBS could not be resolved."""
+    if isinstance(actuals, pd.DataFrame):
+        yield from _iter_actual_frame(actuals, tenant_id, user_ids, wbs_ids)
+        return
+    for rec in actuals:
+        uid = user_ids.get(rec["emp_id"])
+        wid = wbs_ids.get(rec["wbs_code"])
+        if not uid or not wid:
+            continue
+        yield (
+            None,
+            tenant_id,
+            uid,
+            wid,
+            rec["work_date"],
+            rec["hours"],
+            rec["pay_type"],
+            rec["pay_type_name"],
+            rec["business_unit"],
+            rec["project_code"],
+            rec["project_name"],
+        )
+
+
+def _iter_actual_frame(actuals: pd.DataFrame, tenant_id, user_ids, wbs_ids):
+    uids = actuals["emp_id"].map(user_ids)
+    wids = actuals["wbs_code"].map(wbs_ids)
+    keep = uids.notna() & wids.notna()
+    yield from zip(
+        actuals.loc[keep, "id"].tolist() if "id" in actuals else itertools.repeat(None),
+        itertools.repeat(tenant_id),
+        uids[keep].tolist(),
+        wids[keep].tolist(),
+        *(actuals.loc[keep, col].tolist() for col in (
+            "work_date", "hours", "pay_type", "pay_type_name", "business_unit", "project_code", "project_name",
+        )),
+    )
+
+
+def ensure_load_watermark_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS seed_load_watermarks (
+            tenant_id uuid PRIMARY KEY,
+            max_work_date date,
+            source_file text,
+            source_hash text,
+            rows_loaded bigint NOT NULL DEFAULT 0,
+            updated_at timestamptz NOT NULL DEFAULT now()
+        );
+        """
+    )
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_load_watermark(cur, tenant_id, lock: bool = True):
+    """Return (max_work_date, source_hash) of the tenant's last completed load, or (None, None)."""
+    execute_prepared(
+        cur,
+        "seed_watermark_lock" if lock else "seed_watermark",
+        "SELECT max_work_date, source_hash FROM seed_load_watermarks WHERE tenant_id=%s" + (" FOR UPDATE" if lock else ""),
+        (tenant_id,),
+    )
+    row = cur.fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def record_load_watermark(cur, tenant_id, source: Path, source_hash: str, max_work_date, rows_loaded: int):
+    execute_prepared(
+        cur,
+        "seed_record_watermark",
+        """
+        INSERT INTO seed_load_watermarks (tenant_id, max_work_date, source_file, source_hash, rows_loaded, updated_at)
+        VALUES (%s, %s, %s, %s, %s, now())
+        ON CONFLICT (tenant_id) DO UPDATE SET
+            max_work_date = GREATEST(seed_load_watermarks.max_work_date, EXCLUDED.max_work_date),
+            source_file = EXCLUDED.source_file,
+            source_hash = EXCLUDED.source_hash,
+            rows_loaded = EXCLUDED.rows_loaded,
+            updated_at = EXCLUDED.updated_at
+        """,
+        (tenant_id, max_work_date, source.name, source_hash, rows_loaded),
+    )
+
+
+CHECKPOINT_BATCH_ROWS = 100000
+
+
+def ensure_load_checkpoint_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS seed_load_checkpoints (
+            tenant_id uuid NOT NULL,
+            source_hash text NOT NULL,
+            phase text NOT NULL,
+            source_file text,
+            rows_done bigint NOT NULL DEFAULT 0,
+            completed boolean NOT NULL DEFAULT false,
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (tenant_id, source_hash, phase)
+        );
+        """
+    )
+
+
+class LoadCheckpoint:
+    """Per-phase progress of a checkpointed load of one file into one tenant, kept in seed_load_checkpoints."""
+
+    def __init__(self, conn, tenant_id, source: Path, source_hash: str):
+        self.conn = conn
+        self.tenant_id = tenant_id
+        self.source = source
+        self.source_hash = source_hash
+        self.phases = {}
+
+    def start(self, cur, resume: bool):
+        if not resume:
+            self.clear(cur)
+            return
+        cur.execute(
+            "SELECT phase, rows_done, completed FROM seed_load_checkpoints WHERE tenant_id=%s AND source_hash=%s",
+            (self.tenant_id, self.source_hash),
+        )
+        self.phases = {phase: (rows_done, completed) for phase, rows_done, completed in cur.fetchall()}
+        if self.phases:
+            done = ", ".join(p if c else f"{p} ({r} rows)" for p, (r, c) in self.phases.items())
+            print(f"Resuming load of {self.source.name}: already committed {done}")
+        else:
+            print(f"No checkpoint for {self.source.name} in this tenant; starting from the beginning")
+
+    def completed(self, phase: str) -> bool:
+        return self.phases.get(phase, (0, False))[1]
+
+    def rows_done(self, phase: str) -> int:
+        return self.phases.get(phase, (0, False))[0]
+
+    def save(self, cur, phase: str, rows_done: int = 0, completed: bool = True):
+        execute_prepared(
+            cur,
+            "seed_save_checkpoint",
+            """
+            INSERT INTO seed_load_checkpoints (tenant_id, source_hash, phase, source_file, rows_done, completed, updated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, now())
+            ON CONFLICT (tenant_id, source_hash, phase) DO UPDATE SET
+                rows_done = EXCLUDED.rows_done, completed = EXCLUDED.completed, updated_at = EXCLUDED.updated_at
+            """,
+            (self.tenant_id, self.source_hash, phase, self.source.name, rows_done, completed),
+        )
+        self.conn.commit()
+        self.phases[phase] = (rows_done, completed)
+
+    def clear(self, cur):
+        cur.execute(
+            "DELETE FROM seed_load_checkpoints WHERE tenant_id=%s AND source_hash=%s",
+            (self.tenant_id, self.source_hash),
+        )
+        self.phases = {}
+
+
+def ensure_employee_email_table(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS seed_employee_emails (
+            tenant_id uuid NOT NULL,
+            emp_id bigint NOT NULL,
+            email text NOT NULL,
+            PRIMARY KEY (tenant_id, emp_id)
+        );
+        """
+    )
+    # users.email is global, so a claim is too: concurrent tenant loads wait on each other's namesakes.
+    cur.execute("SELECT to_regclass('seed_employee_emails_email') IS NOT NULL")
+    if cur.fetchone()[0]:
+        return
+    cur.execute("SELECT email FROM seed_employee_emails GROUP BY email HAVING count(*) > 1 ORDER BY email LIMIT 5")
+    shared = [email for (email,) in cur.fetchall()]
+    if shared:
+        raise LoadError(
+            "seed_employee_emails has emails claimed by more than one tenant (e.g. " + ", ".join(shared) + "); "
+            "re-point those employees' claims and users, then re-run"
+        )
+    cur.execute("CREATE UNIQUE INDEX seed_employee_emails_email ON seed_employee_emails (email)")
+
+
+def load_email_index(cur, tenant_id) -> EmailIndex:
+    """The tenant's earlier email claims, plus every email its employees may not take."""
+    cur.execute("SELECT to_regclass('seed_employee_emails') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        cur.execute(
+            """
+            SELECT u.email FROM users u
+            WHERE NOT EXISTS (SELECT 1 FROM tenant_memberships m WHERE m.user_id = u.id AND m.tenant_id = %s)
+            """,
+            (tenant_id,),
+        )
+        return EmailIndex(taken=[email for (email,) in cur.fetchall()])
+    cur.execute("SELECT emp_id, email FROM seed_employee_emails WHERE tenant_id=%s", (tenant_id,))
+    claims = cur.fetchall()
+    cur.execute(
+        """
+        SELECT email FROM seed_employee_emails WHERE tenant_id <> %s
+        UNION
+        SELECT u.email FROM users u
+        WHERE NOT EXISTS (SELECT 1 FROM tenant_memberships m WHERE m.user_id = u.id AND m.tenant_id = %s)
+        """,
+        (tenant_id, tenant_id),
+    )
+    return EmailIndex(claims, taken=[email for (email,) in cur.fetchall()])
+
+
+def reconcile_emails(index: EmailIndex, employees) -> int:
+    """Rewrite each employee's file-derived email against the claims in index; returns how many changed."""
+    changed = 0
+    for emp_id, data in employees.items():
+        email = index.resolve(emp_id, data["first"], data["last"], data["email"])
+        if email != data["email"]:
+            data["email"] = email
+            changed += 1
+    return changed
+
+
+def claim_employee_emails(cur, tenant_id, employees) -> int:
+    """Reconcile employees' emails with earlier loads; returns how many file-derived emails moved."""
+    index = load_email_index(cur, tenant_id)
+    changed = reconcile_emails(index, employees)
+    while index.new:
+        claimed = extras.execute_values(
+            cur,
+            "INSERT INTO seed_employee_emails (tenant_id, emp_id, email) VALUES %s ON CONFLICT DO NOTHING RETURNING emp_id",
+            [(tenant_id, emp_id, email) for emp_id, email in index.new.items()],
+            page_size=5000,
+            fetch=True,
+        )
+        lost = set(index.new) - {emp_id for (emp_id,) in claimed}
+        if not lost:
+            break
+        # A concurrent load committed these emails (or employees) first: re-read the claims and resolve again.
+        index = load_email_index(cur, tenant_id)
+        changed += reconcile_emails(index, {emp_id: employees[emp_id] for emp_id in lost})
+    if changed:
+        print(f"  emails: {changed} employees kept the email an earlier load gave them or avoided a namesake's")
+    return changed
+
+
+def lookup_user_ids(cur, employees) -> dict:
+    """{emp_id: user id} for employees a previous (checkpointed) run already upserted."""
+    emp_by_email = {data["email"]: emp_id for emp_id, data in employees.items()}
+    cur.execute("SELECT email, id FROM users WHERE email = ANY(%s)", (list(emp_by_email),))
+    return {emp_by_email[email]: user_id for email, user_id in cur.fetchall()}
+
+
+@functools.lru_cache(maxsize=None)
+def counting_connection_class():
+    """The connection class every connection uses; defined on first use so importing psycopg2 can wait."""
+
+    class CountingCursor(psycopg2.extensions.cursor):
+        """Counts statements sent to the server (execute_values issues one per page) for the run report."""
+
+        def execute(self, query, vars=None):
+            self.connection.round_trips += 1
+            return super().execute(query, vars)
+
+        def executemany(self, query, vars_list):
+            vars_list = list(vars_list)
+            self.connection.round_trips += len(vars_list)
+            return super().executemany(query, vars_list)
+
+        def copy_expert(self, sql, file, size=8192):
+            self.connection.round_trips += 1
+            return super().copy_expert(sql, file, size)
+
+    class CountingConnection(psycopg2.extensions.connection):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.round_trips = 0
+            self.prepared = set()  # statement names PREPAREd in this session; they outlive rollbacks
+            self.cursor_factory = CountingCursor
+
+    return CountingConnection
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its finished children (parse workers), or None off Unix."""
+    if resource is None:
+        return None
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(peak_kb / 1024, 1)  # ru_maxrss is in KiB on Linux
+
+
+@dataclass
+class PhaseStats:
+    phase: str
+    rows: int = 0
+    inserted: int = None
+    updated: int = None
+    skipped: int = None
+    seconds: float = 0.0
+    round_trips: int = None
+    peak_rss_mb: float = None
+
+
+class RunReport:
+    """Per-phase wall time, row counts, round trips and peak RSS for one load, emitted as JSON with --report."""
+
+    def __init__(self, source: Path = None, tenant: str = None):
+        self.source = source
+        self.tenant = tenant
+        self.started_at = dt.datetime.utcnow()
+        self.phases = []
+        self._t0 = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name: str, cur=None, rows: int = 0):
+        stats = PhaseStats(name, rows=rows)
+        trips = cur.connection.round_trips if cur is not None else None
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds = round(time.perf_counter() - started, 4)
+            if trips is not None:
+                stats.round_trips = cur.connection.round_trips - trips
+            stats.peak_rss_mb = peak_rss_mb()
+            self.phases.append(stats)
+
+    def as_dict(self) -> dict:
+        return {
+            "source": str(self.source) if self.source else None,
+            "tenant": self.tenant,
+            "started_at": self.started_at.isoformat() + "Z",
+            "wall_seconds": round(time.perf_counter() - self._t0, 4),
+            "round_trips": sum(p.round_trips or 0 for p in self.phases),
+            "peak_rss_mb": peak_rss_mb(),
+            "connection": asdict(CONNECTION_OPTIONS),
+            "phases": [asdict(p) for p in self.phases],
+        }
+
+    def print_table(self):
+        print(f"{'phase':<22}{'seconds':>9}{'rows':>10}{'inserted':>10}{'updated':>9}{'skipped':>9}{'trips':>7}")
+        for p in self.phases:
+            cells = (p.inserted, p.updated, p.skipped, p.round_trips)
+            ins, upd, skp, trips = ("" if v is None else v for v in cells)
+            print(f"{p.phase:<22}{p.seconds:>9.2f}{p.rows:>10}{ins:>10}{upd:>9}{skp:>9}{trips:>7}")
+
+
+def write_report(path: Path, payload: dict):
+    path.write_text(json.dumps(payload, indent=2, default=str), encoding="utf-8")
+    print(f"Run report written to {path}")
+
+
+SESSION_SETTINGS = {"synchronous_commit": "off"}
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+LOCAL_SOCKET_DIRS = ("/var/run/postgresql", "/run/postgresql", "/tmp")
+
+
+@dataclass
+class ConnectionOptions:
+    """Connection tuning for this run; each switch has a --no-* flag so its effect can be measured on its own."""
+
+    session_tuning: bool = True  # SESSION_SETTINGS plus work_mem, sent as startup options (no extra round trip)
+    work_mem: str = "256MB"
+    prepared: bool = True  # PREPARE the tenant/watermark/checkpoint statements (execute_prepared)
+    local_socket: bool = True  # a localhost server with a Unix socket is reached through the socket
+
+
+CONNECTION_OPTIONS = ConnectionOptions()
+
+
+def local_socket_dir(port: int):
+    for directory in LOCAL_SOCKET_DIRS:
+        if Path(directory, f".s.PGSQL.{port}").exists():
+            return directory
+    return None
+
+
+def connection_params(options: ConnectionOptions = None) -> dict:
+    """psycopg2.connect keyword arguments: the appsettings connection plus this run's tuning."""
+    options = options or CONNECTION_OPTIONS
+    params = dict(load_connection())
+    if options.local_socket and params["host"] in LOCAL_HOSTS:
+        socket_dir = local_socket_dir(params["port"])
+        if socket_dir:
+            # No TCP/TLS handshake or loopback copies; libpq never uses TLS on a Unix socket anyway.
+            params.update(host=socket_dir, sslmode="disable")
+    if options.session_tuning:
+        # Losing the last few commits on a server crash is fine for a re-runnable load (a checkpoint row
+        # commits with its batch, so --resume stays consistent); it never corrupts data.
+        settings = {**SESSION_SETTINGS, "work_mem": options.work_mem}
+        params["options"] = " ".join(f"-c {name}={value}" for name, value in settings.items())
+    return params
+
+
+def connect():
+    conn = psycopg2.connect(**connection_params(), connection_factory=counting_connection_class())
+    conn.autocommit = False
+    extras.register_uuid()
+    return conn
+
+
+def open_pool(maxconn: int) -> psycopg2.pool.ThreadedConnectionPool:
+    """Thread-safe pool of up to maxconn connections set up like connect(); close with closeall()."""
+    extras.register_uuid()
+    return psycopg2.pool.ThreadedConnectionPool(
+        1, maxconn, **connection_params(), connection_factory=counting_connection_class()
+    )
+
+
+def execute_prepared(cur, name: str, sql: str, params):
+    """Execute sql (%s placeholders) through a per-session prepared statement, PREPAREd on first use."""
+    conn = cur.connection
+    if not CONNECTION_OPTIONS.prepared or not isinstance(conn, counting_connection_class()):
+        cur.execute(sql, params)
+        return
+    if name not in conn.prepared:
+        numbers = itertools.count(1)
+        cur.execute(f"PREPARE {name} AS " + re.sub(r"%s", lambda _: f"${next(numbers)}", sql))
+        conn.prepared.add(name)
+    cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+
+def upsert_admin_user(cur, tenant_id, now):
+    # Admin user (platform + tenant admin). The upsert never replaces a password, so only hash for a new admin.
+    cur.execute("SELECT 1 FROM users WHERE email=%s", (ADMIN_EMAIL,))
+    admin_pwd_hash = None if cur.fetchone() else hash_passwords(ADMIN_PASSWORD, 1, workers=1)[0]
+    admin_user = {
+        "id": uuid.uuid4(),
+        "entra": str(uuid.uuid4()),
+        "email": ADMIN_EMAIL,
+        "display": ADMIN_DISPLAY,
+        "pwd": admin_pwd_hash,
+        "is_sys": True,
+        "active": True,
+        "deactivated_at": None,
+        "job_title": "Platform Admin",
+        "department": "Admin",
+        "org_unit": "Admin",
+        "location": None,
+        "labor_category": None,
+        "cost_center": None,
+        "type": 0,
+        "status": 0,
+        "tenant_id": tenant_id,
+        "now": now,
+    }
+    return upsert_users(cur, [admin_user])[0][ADMIN_EMAIL]
+
+
+def _hash_batch(password: str, count: int, rounds: int) -> list:
+    """Process-pool entry point: count bcrypt hashes of password, each with a fresh salt."""
+    secret = password.encode()
+    return [bcrypt.hashpw(secret, bcrypt.gensalt(rounds)).decode() for _ in range(count)]
+
+
+def hash_passwords(password: str, count: int, rounds: int = BCRYPT_ROUNDS, workers: int = None, pool=None) -> list:
+    """count independently salted bcrypt hashes of password, spread over pool (or a new one of workers)."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or count < 2:
+        return _hash_batch(password, count, rounds)
+    per_task = -(-count // (workers * 4))  # a few tasks per worker keeps the pool busy to the end
+    sizes = [min(per_task, count - start) for start in range(0, count, per_task)]
+    with contextlib.ExitStack() as stack:
+        if pool is None:
+            pool = stack.enter_context(concurrent.futures.ProcessPoolExecutor(max_workers=workers))
+        return [h for batch in pool.map(_hash_batch, itertools.repeat(password), sizes, itertools.repeat(rounds)) for h in batch]
+
+
+def seed_passwords(
+    tenant_names=None,
+    password: str = EMPLOYEE_PASSWORD,
+    rounds: int = BCRYPT_ROUNDS,
+    workers: int = None,
+    batch_users: int = PASSWORD_BATCH_USERS,
+) -> int:
+    """Give the loader's users in tenant_names that have no password hash an initial password; returns the count."""
+    tenant_names = tenant_names or [TENANT_NAME]
+    workers = workers or os.cpu_count() or 1
+    conn = connect()
+    try:
+        with conn.cursor() as cur, contextlib.ExitStack() as stack:
+            cur.execute("SELECT to_regclass('seed_employee_emails') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                print("No users were created by this loader yet (seed_employee_emails is missing); nothing to do.")
+                return 0
+            cur.execute(
+                """
+                SELECT DISTINCT u.id
+                FROM users u
+                JOIN tenant_memberships m ON m.user_id = u.id
+                JOIN tenants t ON t.id = m.tenant_id
+                JOIN seed_employee_emails e ON e.tenant_id = m.tenant_id AND e.email = u.email
+                WHERE u.password_hash IS NULL AND NOT u.is_system_admin AND t.name = ANY(%s)
+                ORDER BY u.id
+                """,
+                (tenant_names,),
+            )
+            user_ids = [row[0] for row in cur.fetchall()]
+            print(f"Hashing initial passwords for {len(user_ids)} users (bcrypt cost {rounds}) ...")
+            pool = None
+            if workers > 1 and len(user_ids) > 1:
+                pool = stack.enter_context(concurrent.futures.ProcessPoolExecutor(max_workers=workers))
+            started = time.perf_counter()
+            updated = 0
+            for start in range(0, len(user_ids), batch_users):
+                batch = user_ids[start:start + batch_users]
+                hashes = hash_passwords(password, len(batch), rounds, workers, pool)
+                # password_hash IS NULL again at write time: a user who set a password meanwhile keeps it.
+                updated += execute_values_rowcount(
+                    cur,
+                    """
+                    UPDATE users AS u
+                    SET password_hash = v.hash, password_changed_at = now(), updated_at = now()
+                    FROM (VALUES %s) AS v(id, hash)
+                    WHERE u.id = v.id AND u.password_hash IS NULL
+                    """,
+                    list(zip(batch, hashes)),
+                    template="(%s::uuid, %s)",
+                    page_size=batch_users,
+                )
+                conn.commit()
+            report_phase("passwords", updated, started)
+            return updated
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def upsert_admin_membership(cur, admin_id, tenant_id, now):
+    upsert_memberships(
+        cur,
+        [
+            {
+                "id": uuid.uuid4(),
+                "user_id": admin_id,
+                "tenant_id": tenant_id,
+                "roles": extras.Json([0, 6, 4, 5, 2, 7, 8]),  # Employee, TenantAdmin, ResourceManager, OfficeManager, ProjectManager, Executive, OverrideApprover
+                "active": True,
+                "joined": now,
+                "now": now,
+            }
+        ],
+    )
+
+
+def write_users(cur, employees, tenant_id, now, report) -> dict:
+    """Upsert employees, their memberships and manager links; returns {emp_id: user id}."""
+    claim_employee_emails(cur, tenant_id, employees)
+    user_payloads = {}
+    for emp_id, data in employees.items():
+        active = bool(data["active"])
+        status = 0 if active else 1
+        user_payloads[emp_id] = {
+            "id": uuid.uuid4(),
+            "entra": str(uuid.uuid4()),
+            "email": data["email"],
+            "display": data["display_name"],
+            "pwd": None,
+            "is_sys": False,
+            "active": active,
+            "deactivated_at": data["termination_date"] if not active else None,
+            "job_title": None,
+            "department": data["department"],
+            "org_unit": data["department"],
+            "location": None,
+            "labor_category": None,
+            "cost_center": None,
+            "type": 0,  # Employee
+            "status": status,
+            "tenant_id": tenant_id,
+            "now": now,
+        }
+    with report.phase("users", cur, rows=len(user_payloads)) as ph:
+        ids_by_email, ph.inserted = upsert_users(cur, user_payloads.values())
+        ph.updated = len(ids_by_email) - ph.inserted
+    user_ids = {emp_id: ids_by_email[p["email"]] for emp_id, p in user_payloads.items()}
+    with report.phase("memberships", cur, rows=len(user_payloads)) as ph:
+        ph.inserted = upsert_memberships(
+            cur,
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user_ids[emp_id],
+                    "tenant_id": tenant_id,
+                    "roles": extras.Json([0]),  # Employee
+                    "active": p["active"],
+                    "joined": now,
+                    "now": now,
+                }
+                for emp_id, p in user_payloads.items()
+            ],
+        )
+        ph.updated = len(set(user_ids.values())) - ph.inserted
+
+    # Manager relationships
+    with report.phase("managers", cur, rows=len(employees)) as ph:
+        manager_of, dangling, cycles = resolve_manager_hierarchy(employees)
+        report_manager_issues(dangling, cycles)
+        ph.updated = update_managers(cur, user_ids, manager_of)
+        ph.skipped = len(dangling)
+    return user_ids
+
+
+def write_assignments(cur, assignments, tenant_id, user_ids, wbs_ids, now, report, pipeline: bool = False):
+    # Assignments (de-dupe against existing; existing ones are widened to cover the loaded hours)
+    with report.phase("assignments", cur, rows=len(assignments)) as ph:
+        existing_assignments = load_existing_assignments(cur, tenant_id)
+        periods = allocation_periods(assignments)
+        assignment_rows = []
+        widen_rows = []
+        for (emp_id, wbs_code), agg in assignments.items():
+            uid = user_ids.get(emp_id)
+            wid = wbs_ids.get(wbs_code)
+            if not uid or not wid:
+                continue
+            new_periods, widen = split_periods(periods[(emp_id, wbs_code)], existing_assignments.get((uid, wid)))
+            if widen:
+                widen_rows.append((uid, wid, *widen))
+            for start, end, allocation_pct in new_periods:
+                assignment_rows.append(
+                    (
+                        uuid.uuid4(),
+                        tenant_id,
+                        uid,
+                        None,  # project_role_id
+                        wid,
+                        allocation_pct,
+                        start,
+                        end,
+                        3,  # Active
+                        False,
+                        None,
+                        None,
+                        now,
+                        now,
+                        False,
+                    )
+                )
+        # Widen first: the boundary rows are the pair's existing first and last rows, not the periods added after.
+        ph.updated = widen_assignments(cur, tenant_id, widen_rows, now, pipeline)
+        ph.inserted = insert_assignments(cur, tenant_id, assignment_rows, pipeline)
+        ph.skipped = max(len(widen_rows) - ph.updated, 0)  # existing rows already covering the hours
+
+
+def write_models(
+    cur, tenant_id, employees, projects, wbs_map, assignments, report, admin_id=None, pipeline: bool = False
+):
+    """Everything except actual hours; returns (user_ids, wbs_ids, now)."""
+    now = dt.datetime.utcnow()
+    with report.phase("admin", cur, rows=1):
+        if admin_id is None:
+            admin_id = upsert_admin_user(cur, tenant_id, now)
+        upsert_admin_membership(cur, admin_id, tenant_id, now)
+    user_ids = write_users(cur, employees, tenant_id, now, report)
+
+    # Projects and WBS
+    with report.phase("projects", cur, rows=len(projects)) as ph:
+        project_ids, ph.inserted = upsert_projects(cur, projects, tenant_id)
+        ph.skipped = len(projects) - ph.inserted
+    with report.phase("wbs", cur, rows=len(wbs_map)) as ph:
+        wbs_ids, ph.inserted = upsert_wbs_elements(cur, wbs_map, tenant_id, project_ids)
+        ph.skipped = len(wbs_map) - ph.inserted
+
+    write_assignments(cur, assignments, tenant_id, user_ids, wbs_ids, now, report, pipeline)
+    return user_ids, wbs_ids, now
+
+
+def write_actuals(
+    cur, actuals, tenant_id, user_ids, wbs_ids, now, bulk_mode: str, report, partitions=None, pipeline: bool = False
+):
+    with report.phase("actual_hours", cur, rows=len(actuals)) as ph:
+        if bulk_mode == "copy":
+            rows = iter_actual_values(actuals, tenant_id, user_ids, wbs_ids)
+            _, ph.inserted = copy_actuals(cur, rows, partitions, pipeline)
+        else:
+            actual_rows = [
+                (row_id or uuid.uuid4(), *values, now)
+                for row_id, *values in iter_actual_values(actuals, tenant_id, user_ids, wbs_ids)
+            ]
+            ph.inserted = insert_actuals(cur, actual_rows, partitions, pipeline)
+        # Rows whose user/WBS could not be resolved never reach the database; the rest collided with existing rows.
+        ph.skipped = len(actuals) - ph.inserted
+
+
+def write_rollups(cur, tenant_id, actuals, user_ids, wbs_ids, report):
+    """Refresh the reporting rollups for the weeks/months touched by this load (streamed actuals are an int)."""
+    with report.phase("rollups", cur) as ph:
+        keys = None if isinstance(actuals, int) else rollup_week_keys(actuals, user_ids, wbs_ids)
+        weeks, months = refresh_rollups(cur, tenant_id, keys)
+        ph.rows = len(keys) if keys is not None else weeks
+        ph.updated = weeks + months
+    print(f"  rollups: {weeks} user/WBS weeks and {months} project months refreshed")
+
+
+ACTUALS_TARGETS = ("daily", "buckets")
+BUCKET_GRAINS = ("month", "week")
+BUCKET_SOURCE_PREFIX = "load_aleut_seed:"  # source_reference of buckets this loader owns (and may replace)
+ACTUAL_HOURS_SOURCE_SPREADSHEET = 1  # ActualHoursSource.SpreadsheetUpload
+IMPORT_TYPE = 1  # ForecastImportExportType.Import
+IMPORT_STATUS_IN_PROGRESS = 0
+IMPORT_STATUS_COMPLETED = 1
+IMPORT_STATUS_COMPLETED_WITH_ERRORS = 2
+ROLE_ASSIGNMENT_ACTIVE = 1  # ProjectRoleAssignmentStatus.Active
+ROLE_ASSIGNMENT_TITLE = "Timesheet charge"
+BUCKET_COLUMNS = (
+    "id", "tenant_id", "project_role_assignment_id", "year", "month", "week", "hours", "source",
+    "source_reference", "import_operation_id", "created_at", "is_deleted",
+)
+
+
+def period_buckets(actuals, grain: str = "month") -> pd.DataFrame:
+    """Sum actual hours per employee, WBS and Year/Month (and Week of month with grain "week")."""
+    frame = drop_unique_duplicates(actuals)
+    dates = pd.to_datetime(frame["work_date"])
+    keys = pd.DataFrame(
+        {"emp_id": frame["emp_id"], "wbs_code": frame["wbs_code"], "year": dates.dt.year, "month": dates.dt.month}
+    )
+    if grain == "week":
+        keys["week"] = (dates.dt.day - 1) // 7 + 1
+    keys["hours"] = frame["hours"].astype(float).round(2)
+    buckets = keys.groupby(list(keys.columns[:-1]), sort=False)["hours"].agg(hours="sum", entries="size").reset_index()
+    buckets["hours"] = buckets["hours"].round(2)
+    if grain != "week":
+        buckets["week"] = None
+    return buckets
+
+
+def actual_hours_is_buckets(cur):
+    """True if actual_hours is the application's EF period-bucket table, False if the loader's daily table, None if absent."""
+    cur.execute(
+        """
+        SELECT bool_or(column_name = 'project_role_assignment_id')
+        FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'actual_hours'
+        """
+    )
+    return cur.fetchone()[0]
+
+
+def upsert_role_assignments(cur, tenant_id, assignments, user_ids, wbs_ids, now):
+    """A ProjectRoleAssignment per employee/WBS; returns ({(emp_id, wbs_code): id}, inserted)."""
+    rows = [
+        (uuid.uuid4(), user_ids[emp_id], wbs_ids[code], agg["start"], agg["end"])
+        for (emp_id, code), agg in assignments.items()
+        if user_ids.get(emp_id) and wbs_ids.get(code)
+    ]
+    if not rows:
+        return {}, 0
+    values = "(%s::uuid, %s::uuid, %s::uuid, %s::date, %s::date)"
+    insert_sql = cur.mogrify(
+        """
+        INSERT INTO project_role_assignments (
+            id, tenant_id, project_id, wbs_element_id, user_id, is_tbd, position_title,
+            start_date, end_date, status, created_at, updated_at, is_deleted
+        )
+        SELECT v.id, %s, w.project_id, v.wbs_element_id, v.user_id, false, %s,
+               v.start_date, v.end_date, %s, %s, %s, false
+        FROM (VALUES %%s) AS v(id, user_id, wbs_element_id, start_date, end_date)
+        JOIN wbs_elements w ON w.id = v.wbs_element_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM project_role_assignments p
+            WHERE p.tenant_id = %s AND p.user_id = v.user_id AND p.wbs_element_id = v.wbs_element_id AND NOT p.is_deleted
+        )
+        """,
+        (tenant_id, ROLE_ASSIGNMENT_TITLE, ROLE_ASSIGNMENT_ACTIVE, now, now, tenant_id),
+    ).decode()
+    inserted = execute_values_rowcount(cur, insert_sql, rows, template=values, page_size=5000)
+    widen_sql = cur.mogrify(
+        """
+        UPDATE project_role_assignments AS p
+        SET start_date = LEAST(p.start_date, v.start_date),
+            end_date = CASE WHEN p.end_date IS NULL THEN NULL ELSE GREATEST(p.end_date, v.end_date) END,
+            updated_at = %s
+        FROM (VALUES %%s) AS v(id, user_id, wbs_element_id, start_date, end_date)
+        WHERE p.tenant_id = %s AND p.user_id = v.user_id AND p.wbs_element_id = v.wbs_element_id AND NOT p.is_deleted
+          AND (p.start_date > v.start_date OR p.end_date < v.end_date)
+        """,
+        (now, tenant_id),
+    ).decode()
+    execute_values_rowcount(cur, widen_sql, rows, template=values, page_size=5000)
+
+    cur.execute(
+        """
+        SELECT DISTINCT ON (user_id, wbs_element_id) user_id, wbs_element_id, id
+        FROM project_role_assignments
+        WHERE tenant_id = %s AND NOT is_deleted AND user_id = ANY(%s)
+        ORDER BY user_id, wbs_element_id, created_at, id
+        """,
+        (tenant_id, list({row[1] for row in rows})),
+    )
+    by_ids = {(uid, wid): pra_id for uid, wid, pra_id in cur.fetchall()}
+    emp_of = {uid: emp_id for emp_id, uid in user_ids.items()}
+    code_of = {wid: code for code, wid in wbs_ids.items()}
+    return {(emp_of[uid], code_of[wid]): pra_id for (uid, wid), pra_id in by_ids.items() if wid in code_of}, inserted
+
+
+def start_import_operation(cur, tenant_id, source: Path, source_hash: str, now) -> uuid.UUID:
+    """The ForecastImportExport row this run's buckets point at, InProgress until finish_import_operation."""
+    cur.execute("SELECT id FROM users WHERE email=%s", (ADMIN_EMAIL,))
+    operation_id = uuid.uuid4()
+    cur.execute(
+        """
+        INSERT INTO forecast_import_exports (
+            id, tenant_id, type, operation_at, operation_by_user_id, file_name, file_format, file_size_bytes,
+            file_hash, status, records_processed, records_succeeded, records_failed, created_at, is_deleted
+        )
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 0, 0, 0, %s, false)
+        """,
+        (
+            operation_id, tenant_id, IMPORT_TYPE, now, cur.fetchone()[0], source.name[:500],
+            source.suffix.lstrip(".").lower()[:10], source.stat().st_size, source_hash, IMPORT_STATUS_IN_PROGRESS, now,
+        ),
+    )
+    return operation_id
+
+
+def finish_import_operation(cur, operation_id, processed: int, failed: int, now):
+    status = IMPORT_STATUS_COMPLETED_WITH_ERRORS if failed else IMPORT_STATUS_COMPLETED
+    errors = extras.Json({"unresolved_rows": failed}) if failed else None
+    cur.execute(
+        """
+        UPDATE forecast_import_exports
+        SET status = %s, records_processed = %s, records_succeeded = %s, records_failed = %s,
+            error_details = %s, updated_at = %s
+        WHERE id = %s
+        """,
+        (status, processed, processed - failed, failed, errors, now, operation_id),
+    )
+
+
+def write_period_buckets(cur, tenant_id, actuals, assignments, user_ids, wbs_ids, now, source, source_hash, grain, report):
+    """--actuals buckets: replace the loader's earlier buckets for the same assignments and months."""
+    with report.phase("role assignments", cur, rows=len(assignments)) as ph:
+        role_ids, ph.inserted = upsert_role_assignments(cur, tenant_id, assignments, user_ids, wbs_ids, now)
+    with report.phase("period buckets", cur, rows=len(actuals)) as ph:
+        buckets = period_buckets(actuals, grain)
+        buckets["role_id"] = [role_ids.get(key) for key in zip(buckets["emp_id"], buckets["wbs_code"])]
+        unresolved = int(buckets.loc[buckets["role_id"].isna(), "entries"].sum())
+        buckets = buckets[buckets["role_id"].notna()]
+        operation_id = start_import_operation(cur, tenant_id, source, source_hash, now)
+        months = buckets[["role_id", "year", "month"]].drop_duplicates()
+        delete_sql = cur.mogrify(
+            """
+            DELETE FROM actual_hours a
+            USING (VALUES %%s) AS v(role_id, year, month)
+            WHERE a.tenant_id = %s AND a.project_role_assignment_id = v.role_id
+              AND a.year = v.year AND a.month = v.month AND starts_with(a.source_reference, %s)
+            """,
+            (tenant_id, BUCKET_SOURCE_PREFIX),
+        ).decode()
+        ph.updated = execute_values_rowcount(
+            cur,
+            delete_sql,
+            list(months.itertuples(index=False, name=None)),
+            template="(%s::uuid, %s::int, %s::int)",
+            page_size=5000,
+        )
+        reference = (BUCKET_SOURCE_PREFIX + source.name)[:500]
+        ph.inserted = copy_rows(
+            cur,
+            "actual_hours",
+            BUCKET_COLUMNS,
+            (
+                (uuid.uuid4(), tenant_id, role_id, year, month, week, hours, ACTUAL_HOURS_SOURCE_SPREADSHEET,
+                 reference, operation_id, now, False)
+                for role_id, year, month, week, hours in zip(
+                    buckets["role_id"], buckets["year"].tolist(), buckets["month"].tolist(),
+                    buckets["week"].tolist(), buckets["hours"].tolist(),
+                )
+            ),
+        )
+        ph.skipped = unresolved
+        finish_import_operation(cur, operation_id, len(actuals), unresolved, now)
+    print(f"  period buckets: {ph.inserted} {grain} buckets from {len(actuals)} daily rows ({ph.updated} replaced)")
+
+
+def print_counts(employees, projects, wbs_map, assignments, actual_rows: int):
+    print(f"Employees: {len(employees)}, Projects: {len(projects)}, WBS: {len(wbs_map)}, Assignments: {len(assignments)}, Actual rows: {actual_rows}")
+
+
+def resolve_since(cur, tenant_id, source: Path, source_hash: str, lookback_days: int, lock: bool = True):
+    """Incremental cut-off for a tenant: (skip, since). skip is True when this exact file was the last one loaded."""
+    watermark, last_hash = get_load_watermark(cur, tenant_id, lock)
+    if last_hash == source_hash:
+        print(f"{source.name} is unchanged since the last load (sha256 {source_hash[:12]}); nothing to do.")
+        return True, None
+    if watermark is None:
+        print(f"Incremental load of {source.name}: no watermark for this tenant yet, loading everything")
+        return False, None
+    since = watermark - dt.timedelta(days=lookback_days)
+    print(f"Incremental load of {source.name}: rows from {since} (watermark {watermark}, lookback {lookback_days} days)")
+    return False, since
+
+
+def write_load(
+    cur, tenant_id, models, source: Path, source_hash: str, bulk_mode: str, report, admin_id=None, partition=None,
+    rollups: bool = True, pipeline: bool = False, first_load: bool = False, buckets: str = None,
+) -> int:
+    """Write parsed models for one input file and advance the tenant watermark; returns the actual row count."""
+    employees, projects, wbs_map, assignments, actuals = models
+    actual_count = actuals if isinstance(actuals, int) else len(actuals)
+    print_counts(employees, projects, wbs_map, assignments, actual_count)
+
+    user_ids, wbs_ids, now = write_models(
+        cur, tenant_id, employees, projects, wbs_map, assignments, report, admin_id, pipeline
+    )
+
+    if buckets:
+        write_period_buckets(
+            cur, tenant_id, actuals, assignments, user_ids, wbs_ids, now, source, source_hash, buckets, report
+        )
+        with report.phase("watermark", cur, rows=1):
+            record_load_watermark(cur, tenant_id, source, source_hash, actual_span(wbs_map)[1], actual_count)
+        return actual_count
+
+    # Actual hours
+    partitions = ensure_actual_partitions(cur, *actual_span(wbs_map), partition)
+    if isinstance(actuals, int):
+        if first_load:
+            print("Note: --first-load does not apply to --stream (rows are de-duplicated by the unique index)")
+        with report.phase("actual_hours", cur, rows=actuals) as ph:
+            ph.inserted = merge_raw_actuals(cur, tenant_id, user_ids, wbs_ids, partitions)
+            ph.skipped = actuals - ph.inserted
+    else:
+        deferred = []
+        if first_load:
+            with report.phase("drop indexes", cur) as ph:
+                deferred = defer_actual_indexes(cur)
+                ph.rows = len(deferred)
+            if deferred:
+                actuals_in = len(actuals)
+                actuals = drop_unique_duplicates(actuals)
+            else:
+                print("Note: actual_hours already has rows; --first-load keeps its indexes")
+        write_actuals(cur, actuals, tenant_id, user_ids, wbs_ids, now, bulk_mode, report, partitions, pipeline)
+        if deferred:
+            # Count the rows dropped in memory against the actual_hours phase, as the index would have.
+            actuals_phase = report.phases[-1]
+            actuals_phase.rows, actuals_phase.skipped = actuals_in, actuals_phase.skipped + actuals_in - len(actuals)
+            with report.phase("rebuild indexes", cur, rows=len(deferred)):
+                rebuild_actual_indexes(cur, deferred)
+    if rollups:
+        write_rollups(cur, tenant_id, actuals, user_ids, wbs_ids, report)
+
+    with report.phase("watermark", cur, rows=1):
+        record_load_watermark(cur, tenant_id, source, source_hash, actual_span(wbs_map)[1], actual_count)
+    return actual_count
+
+
+def write_load_checkpointed(
+    cur, tenant_id, models, source: Path, source_hash: str, bulk_mode: str, report, batch_rows: int, resume: bool,
+    partition=None, rollups: bool = True, pipeline: bool = False,
+) -> int:
+    """write_load, committing after each phase and every batch_rows actual rows; returns the actual row count."""
+    employees, projects, wbs_map, assignments, actuals = models
+    print_counts(employees, projects, wbs_map, assignments, len(actuals))
+    checkpoint = LoadCheckpoint(cur.connection, tenant_id, source, source_hash)
+    checkpoint.start(cur, resume)
+    now = dt.datetime.utcnow()
+
+    if not checkpoint.completed("users"):
+        with report.phase("admin", cur, rows=1):
+            upsert_admin_membership(cur, upsert_admin_user(cur, tenant_id, now), tenant_id, now)
+        user_ids = write_users(cur, employees, tenant_id, now, report)
+        checkpoint.save(cur, "users", len(user_ids))
+    else:
+        reconcile_emails(load_email_index(cur, tenant_id), employees)
+        user_ids = lookup_user_ids(cur, employees)
+
+    # Both only insert what is missing, so on resume they reduce to the id lookups.
+    with report.phase("projects", cur, rows=len(projects)) as ph:
+        project_ids, ph.inserted = upsert_projects(cur, projects, tenant_id)
+    with report.phase("wbs", cur, rows=len(wbs_map)) as ph:
+        wbs_ids, ph.inserted = upsert_wbs_elements(cur, wbs_map, tenant_id, project_ids)
+    cur.connection.commit()
+
+    if not checkpoint.completed("assignments"):
+        write_assignments(cur, assignments, tenant_id, user_ids, wbs_ids, now, report, pipeline)
+        checkpoint.save(cur, "assignments", len(assignments))
+
+    partitions = ensure_actual_partitions(cur, *actual_span(wbs_map), partition)
+    cur.connection.commit()
+    done = checkpoint.rows_done("actual_hours")
+    rows = itertools.islice(iter_actual_values(actuals, tenant_id, user_ids, wbs_ids), done, None)
+    with report.phase("actual_hours", cur, rows=len(actuals)) as ph:
+        ph.inserted = 0
+        while batch := list(itertools.islice(rows, batch_rows)):
+            if bulk_mode == "copy":
+                ph.inserted += copy_actuals(cur, batch, partitions, pipeline)[1]
+            else:
+                ph.inserted += insert_actuals(
+                    cur, [(row_id or uuid.uuid4(), *values, now) for row_id, *values in batch], partitions, pipeline
+                )
+            done += len(batch)
+            checkpoint.save(cur, "actual_hours", done, completed=False)
+            print(f"  checkpoint: {done} actual rows committed")
+        ph.skipped = len(actuals) - ph.inserted
+    if rollups:
+        write_rollups(cur, tenant_id, actuals, user_ids, wbs_ids, report)
+
+    with report.phase("watermark", cur, rows=1):
+        record_load_watermark(cur, tenant_id, source, source_hash, actual_span(wbs_map)[1], len(actuals))
+        checkpoint.clear(cur)
+    return len(actuals)
+
+
+PLAN_ENTITIES = ("users", "memberships", "managers", "projects", "wbs", "assignments", "actual_hours")
+
+
+def _fetch_existing(conn, sql, params, itersize: int = 50000):
+    """Stream a query through a server-side cursor so large result sets are never buffered whole."""
+    with conn.cursor(name=f"plan_{uuid.uuid4().hex[:8]}") as cur:
+        cur.itersize = itersize
+        cur.execute(sql, params)
+        yield from cur
+
+
+def plan_load(conn, tenant_id, models, deterministic_ids: bool = False) -> dict:
+    """Diff built models against what the tenant already has; returns {entity: {"insert", "update", "unchanged"}}."""
+    employees, projects, wbs_map, assignments, actuals = models
+    plan = {entity: Counter(insert=0, update=0, unchanged=0) for entity in PLAN_ENTITIES}
+    tenant_id = tenant_id or uuid.uuid4()  # a new tenant has nothing; any id matches no rows
+    with conn.cursor() as cur:
+        reconcile_emails(load_email_index(cur, tenant_id), employees)
+
+    # Users: upsert by email, last payload per email wins.
+    by_email = {data["email"]: emp_id for emp_id, data in employees.items()}
+    existing_users = {
+        email: row
+        for email, *row in _fetch_existing(
+            conn,
+            """
+            SELECT email, id, display_name, is_active, status, department, org_unit, tenant_id, manager_id
+            FROM users WHERE email = ANY(%s)
+            """,
+            (list(by_email),),
+        )
+    }
+    user_ids = {}
+    for email, emp_id in by_email.items():
+        data = employees[emp_id]
+        active = bool(data["active"])
+        wanted = (data["display_name"], active, 0 if active else 1, data["department"], data["department"], str(tenant_id))
+        row = existing_users.get(email)
+        if row is None:
+            plan["users"]["insert"] += 1
+            continue
+        user_ids[emp_id] = row[0]
+        have = (row[1], row[2], row[3], row[4], row[5], str(row[6]))
+        plan["users"]["update" if have != wanted else "unchanged"] += 1
+
+    memberships = {
+        user_id: (roles, is_active)
+        for user_id, roles, is_active in _fetch_existing(
+            conn, "SELECT user_id, roles, is_active FROM tenant_memberships WHERE tenant_id=%s", (tenant_id,)
+        )
+    }
+    for email, emp_id in by_email.items():
+        current = memberships.get(user_ids.get(emp_id))
+        if current is None:
+            plan["memberships"]["insert"] += 1
+        else:
+            changed = current != ([0], bool(employees[emp_id]["active"]))
+            plan["memberships"]["update" if changed else "unchanged"] += 1
+
+    manager_of, _, _ = resolve_manager_hierarchy(employees)
+    current_manager = {row[0]: row[7] for row in existing_users.values()}
+    for emp_id, mgr_emp in manager_of.items():
+        uid = user_ids.get(emp_id)
+        wanted = user_ids.get(mgr_emp, "new") if mgr_emp is not None else None
+        changed = current_manager.get(uid) != wanted if uid else wanted is not None
+        plan["managers"]["update" if changed else "unchanged"] += 1
+
+    # Projects and WBS are insert-only.
+    existing_programs = {code for (code,) in _fetch_existing(
+        conn, "SELECT program_code FROM projects WHERE tenant_id=%s", (tenant_id,)
+    )}
+    for code in projects:
+        plan["projects"]["unchanged" if code in existing_programs else "insert"] += 1
+    wbs_ids = {code: wid for code, wid in _fetch_existing(
+        conn, "SELECT code, id FROM wbs_elements WHERE tenant_id=%s", (tenant_id,)
+    )}
+    wbs_ids = {code: wbs_ids[code[:100]] for code in wbs_map if code[:100] in wbs_ids}
+    plan["wbs"]["insert"] = len({code[:100] for code in wbs_map if code not in wbs_ids})
+    plan["wbs"]["unchanged"] = len(wbs_ids)
+
+    existing_assignments = {
+        (uid, wid): (start, end, pct)
+        for uid, wid, start, end, pct in _fetch_existing(conn, EXISTING_ASSIGNMENTS_SQL, (tenant_id,))
+    }
+    periods = allocation_periods(assignments)
+    for key in assignments:
+        current = existing_assignments.get((user_ids.get(key[0]), wbs_ids.get(key[1])))
+        new_periods, widen = split_periods(periods[key], current)
+        plan["assignments"]["insert"] += len(new_periods)
+        if widen:
+            start, end, _ = current
+            changed = start > widen[0] or (end is not None and end < widen[1])
+            plan["assignments"]["update" if changed else "unchanged"] += 1
+
+    first, last = actual_span(wbs_map)
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('actual_hours') IS NOT NULL")
+        has_actuals = cur.fetchone()[0]
+    seen = set()
+    if has_actuals and first is not None:
+        seen = {
+            (uid, wid, day, float(hours), pay_type, pay_type_name)
+            for uid, wid, day, hours, pay_type, pay_type_name in _fetch_existing(
+                conn,
+                """
+                SELECT user_id, wbs_element_id, work_date, hours, pay_type, pay_type_name
+                FROM actual_hours WHERE tenant_id=%s AND work_date BETWEEN %s AND %s
+                """,
+                (tenant_id, first, last),
+            )
+            if deterministic_ids or (pay_type is not None and pay_type_name is not None)
+        }
+    for rec in actual_records(actuals):
+        uid = user_ids.get(rec["emp_id"])
+        wid = wbs_ids.get(rec["wbs_code"])
+        if uid is None or wid is None:
+            plan["actual_hours"]["insert"] += 1
+            continue
+        pay_type, pay_type_name = (None if _is_missing(v) else v for v in (rec["pay_type"], rec["pay_type_name"]))
+        key = (uid, wid, rec["work_date"], round(float(rec["hours"]), 2), pay_type, pay_type_name)
+        if key in seen:
+            plan["actual_hours"]["unchanged"] += 1
+            continue
+        plan["actual_hours"]["insert"] += 1
+        # A later identical row in the file would now conflict with this one.
+        if deterministic_ids or (pay_type is not None and pay_type_name is not None):
+            seen.add(key)
+    return {entity: dict(counts) for entity, counts in plan.items()}
+
+
+def print_plan(plan: dict, tenant_name: str, tenant_exists: bool):
+    print(f"Plan for tenant {tenant_name!r}{'' if tenant_exists else ' (new tenant)'} - nothing was written")
+    print(f"{'entity':<14}{'insert':>10}{'update':>10}{'unchanged':>11}")
+    for entity, counts in plan.items():
+        print(f"{entity:<14}{counts['insert']:>10}{counts['update']:>10}{counts['unchanged']:>11}")
+
+
+def run_plan(
+    input_path: Path,
+    build_impl: str = "vectorized",
+    incremental: bool = False,
+    lookback_days: int = 0,
+    tenant_name: str = TENANT_NAME,
+    ids: str = "random",
+    report_path: Path = None,
+) -> dict:
+    """--plan: read the input and the tenant's current rows in a read-only transaction and report the diff."""
+    if not input_path.exists():
+        raise LoadError(f"Input file not found: {input_path}")
+    conn = connect()
+    conn.set_session(readonly=True)
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM tenants WHERE name=%s LIMIT 1", (tenant_name,))
+            row = cur.fetchone()
+            tenant_id = row[0] if row else None
+            since = None
+            if incremental and tenant_id:
+                cur.execute("SELECT to_regclass('seed_load_watermarks') IS NOT NULL")
+                if cur.fetchone()[0]:
+                    skip, since = resolve_since(cur, tenant_id, input_path, file_sha256(input_path), lookback_days, lock=False)
+                    if skip:
+                        return {}
+        print(f"Reading data from {input_path} ...")
+        validator = InputValidator()  # a dry run writes no reject file
+        models = build_models(read_data(input_path, validator), impl=build_impl, since=since)
+        validator.summary()
+        if ids == "deterministic":
+            models = (*models[:4], assign_actual_ids(models[4], tenant_id or uuid.uuid4()))
+        print_counts(*models[:4], len(models[4]))
+        started = time.perf_counter()
+        plan = plan_load(conn, tenant_id, models, deterministic_ids=ids == "deterministic")
+        print_plan(plan, tenant_name, tenant_id is not None)
+        print(f"Planned in {time.perf_counter() - started:.2f}s")
+        if report_path:
+            write_report(report_path, {"source": str(input_path), "tenant": tenant_name, "plan": plan})
+        return plan
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+EXPORT_BATCH_ROWS = 50000
+EXPORT_PARTITIONS = ("none", "year", "month")
+EXPORT_INPUT_FILE = "input.parquet"  # the loader's own input layout; `load --input` reads it back
+# Per table: the query (tenant bound as %(tenant)s) and the date column its files are partitioned by, if any.
+# Partitioned tables are read in that column's order, so a batch touches one or two partition files and each
+# file gets whole row groups. users leave out password hashes; emp_id comes from the tenant's claims.
+EXPORT_TABLES = {
+    "users": (
+        """
+        SELECT u.id, e.emp_id, u.email, u.display_name, u.is_active, u.status, u.department, u.org_unit,
+               u.manager_id, u.deactivated_at, u.created_at, u.updated_at
+        FROM users u
+        JOIN tenant_memberships m ON m.user_id = u.id AND m.tenant_id = %(tenant)s
+        LEFT JOIN seed_employee_emails e ON e.tenant_id = m.tenant_id AND e.email = u.email
+        """,
+        None,
+    ),
+    "projects": ("SELECT * FROM projects WHERE tenant_id = %(tenant)s", None),
+    "wbs_elements": ("SELECT * FROM wbs_elements WHERE tenant_id = %(tenant)s", None),
+    "assignments": ("SELECT * FROM assignments WHERE tenant_id = %(tenant)s ORDER BY start_date, id", "start_date"),
+    "actual_hours": ("SELECT * FROM actual_hours WHERE tenant_id = %(tenant)s ORDER BY work_date, id", "work_date"),
+}
+# Rows of users without an employee id claim cannot be keyed in the input layout and are left out of it.
+# The employees are resolved once up front (MATERIALIZED): right after a load the statistics are stale, and
+# the planner would otherwise redo the manager lookup for every actual row.
+EXPORT_INPUT_SQL = """
+    WITH emp AS MATERIALIZED (
+        SELECT u.id AS user_id, e.emp_id, u.display_name, u.is_active, u.deactivated_at, me.emp_id AS manager_emp_id
+        FROM seed_employee_emails e
+        JOIN users u ON u.email = e.email
+        LEFT JOIN users mu ON mu.id = u.manager_id
+        LEFT JOIN seed_employee_emails me ON me.tenant_id = e.tenant_id AND me.email = mu.email
+        WHERE e.tenant_id = %(tenant)s
+    )
+    SELECT emp.emp_id AS "Employee_Id", emp.display_name AS "Employee_Name", emp.manager_emp_id AS "Manager_ID",
+           CASE WHEN emp.is_active THEN 'Y' ELSE 'N' END AS "Active_Flag", a.business_unit AS "Business_Unit",
+           NULL::date AS "Hire_date", emp.deactivated_at::date AS "Termination_date", w.code AS "Project_ID",
+           a.project_name AS "Project_Name", a.work_date AS "Hours_Date", a.hours::float8 AS "Entered_Hours",
+           a.pay_type AS "Pay_Type", a.pay_type_name AS "Pay_Type_Name"
+    FROM actual_hours a
+    JOIN emp ON emp.user_id = a.user_id
+    JOIN wbs_elements w ON w.id = a.wbs_element_id
+    WHERE a.tenant_id = %(tenant)s
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def _uuid_as_text():
+    return psycopg2.extensions.new_type((2950,), "UUID_AS_TEXT", lambda value, cur: value)
+
+
+def _arrow_types():
+    import pyarrow as pa
+
+    # Postgres type OIDs; anything else (uuid, json, arrays, text) is written as a string.
+    return {
+        16: pa.bool_(),
+        20: pa.int64(),
+        21: pa.int16(),
+        23: pa.int32(),
+        700: pa.float32(),
+        701: pa.float64(),
+        1700: pa.float64(),
+        1082: pa.date32(),
+        1114: pa.timestamp("us"),
+        1184: pa.timestamp("us", tz="UTC"),
+    }
+
+
+def _as_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+
+def _export_schema(description):
+    import pyarrow as pa
+
+    types = _arrow_types()
+    return pa.schema([pa.field(col.name, types.get(col.type_code, pa.string())) for col in description])
+
+
+def _export_batch(rows, schema):
+    """Column-wise Arrow table from cursor rows; numerics become floats, uuids/json/arrays become text."""
+    import pyarrow as pa
+
+    columns = list(zip(*rows))
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_floating(field.type):
+            values = [None if v is None else float(v) for v in values]
+        try:
+            arrays.append(pa.array(values, type=field.type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Text columns are already str (uuids come back as text, see export_query); json and arrays are not.
+            arrays.append(pa.array([_as_text(v) for v in values], type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _partition_keys(table, column: str, partition: str):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    values = table.column(column)
+    if not pa.types.is_timestamp(values.type):
+        values = values.cast(pa.timestamp("s"))
+    return pc.strftime(values, format="%Y" if partition == "year" else "%Y-%m").to_pylist()
+
+
+class PartitionedParquetWriter:
+    """Parquet writers for one table: a single file, or one file per year/month directory."""
+
+    def __init__(self, root: Path, name: str, schema, partition_column: str = None, partition: str = "none"):
+        self.root = root
+        self.name = name
+        self.schema = schema
+        self.partition_column = partition_column if partition != "none" else None
+        self.partition = partition
+        self.writers = {}
+        self.closed = set()
+        self.rows = 0
+
+    def _writer(self, key):
+        import pyarrow.parquet as pq
+
+        if key not in self.writers:
+            if key in self.closed:
+                raise ValueError(f"{self.name}: rows for {self.partition}={key} arrived after its file was closed")
+            if key is None:
+                path = self.root / f"{self.name}.parquet"
+            else:
+                path = self.root / self.name / f"{self.partition}={key}" / "part-0.parquet"
+                path.parent.mkdir(parents=True, exist_ok=True)
+            self.writers[key] = pq.ParquetWriter(path, self.schema)
+        return self.writers[key]
+
+    def write(self, table):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        self.rows += table.num_rows
+        if self.partition_column is None:
+            self._writer(None).write_table(table)
+            return
+        keys = pa.array(_partition_keys(table, self.partition_column, self.partition))
+        present = [key for key in pc.unique(keys).to_pylist() if key is not None]
+        for key in sorted(self.writers.keys() - set(present) - {None}):
+            if present and key < min(present):
+                self.writers.pop(key).close()
+                self.closed.add(key)
+        for key in pc.unique(keys).to_pylist():
+            self._writer(key).write_table(table.filter(pc.equal(keys, key)))
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+        if not self.writers and not self.closed:
+            self._writer(None).close()  # an empty table still gets a (zero-row) file with its schema
+
+
+def export_query(conn, sql: str, params, writer_for, batch_rows: int = EXPORT_BATCH_ROWS) -> int:
+    """Stream one query through a server-side cursor into the writer writer_for(schema) returns; returns rows."""
+    with conn.cursor(name=f"export_{uuid.uuid4().hex[:8]}") as cur:
+        # uuid columns as text: parsing each into uuid.UUID only to str() it again was most of the export time.
+        psycopg2.extensions.register_type(_uuid_as_text(), cur)
+        cur.itersize = batch_rows
+        cur.execute(sql, params)
+        rows = cur.fetchmany(batch_rows)
+        writer = writer_for(_export_schema(cur.description))
+        try:
+            while rows:
+                writer.write(_export_batch(rows, writer.schema))
+                rows = cur.fetchmany(batch_rows)
+        finally:
+            writer.close()
+        return writer.rows
+
+
+def export_tenant(
+    tenant_name: str, output: Path, partition: str = "month", batch_rows: int = EXPORT_BATCH_ROWS
+) -> dict:
+    """Write a tenant's tables to Parquet from one REPEATABLE READ snapshot; returns {table: rows}."""
+    if output.exists() and any(output.iterdir()):
+        raise LoadError(f"Export directory {output} is not empty; choose a new one so stale partitions cannot mix in")
+    conn = connect()
+    conn.set_session(isolation_level="REPEATABLE READ", readonly=True)
+    counts = {}
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM tenants WHERE name=%s LIMIT 1", (tenant_name,))
+            row = cur.fetchone()
+            if row is None:
+                raise LoadError(f"Tenant not found: {tenant_name}")
+            params = {"tenant": row[0]}
+            cur.execute("SELECT to_regclass('seed_employee_emails') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                raise LoadError("seed_employee_emails is missing, so employee ids are unknown; run a load with this version first")
+        output.mkdir(parents=True, exist_ok=True)
+        print(f"Exporting tenant {tenant_name} to {output} ...")
+        for table, (sql, partition_column) in EXPORT_TABLES.items():
+            started = time.perf_counter()
+            counts[table] = export_query(
+                conn,
+                sql,
+                params,
+                lambda schema: PartitionedParquetWriter(output, table, schema, partition_column, partition),
+                batch_rows,
+            )
+            report_phase(table, counts[table], started)
+        started = time.perf_counter()
+        counts["input"] = export_query(
+            conn,
+            EXPORT_INPUT_SQL,
+            params,
+            lambda schema: PartitionedParquetWriter(output, Path(EXPORT_INPUT_FILE).stem, schema),
+            batch_rows,
+        )
+        report_phase(f"{EXPORT_INPUT_FILE} (loader input)", counts["input"], started)
+        skipped = counts["actual_hours"] - counts["input"]
+        if skipped:
+            print(f"  note: {skipped} actual rows belong to users without an employee id and are not in {EXPORT_INPUT_FILE}")
+        return counts
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def main(
+    input_path: Path,
+    bulk_mode: str = "insert",
+    build_impl: str = "vectorized",
+    stream: bool = False,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+    incremental: bool = False,
+    lookback_days: int = 0,
+    tenant_name: str = TENANT_NAME,
+    report_path: Path = None,
+    checkpoint: bool = False,
+    batch_rows: int = CHECKPOINT_BATCH_ROWS,
+    resume: bool = False,
+    partition: str = None,
+    rollups: bool = True,
+    ids: str = "random",
+    pipeline: bool = False,
+    first_load: bool = False,
+    actuals_target: str = "daily",
+    bucket_grain: str = "month",
+    reject_path: Path = None,
+):
+    if not input_path.exists():
+        raise LoadError(f"Input file not found: {input_path}")
+    checkpoint = checkpoint or resume
+    if checkpoint and stream:
+        raise LoadError("--checkpoint/--resume cannot be combined with --stream: the streamed stage lives only as long as one transaction")
+    if checkpoint and first_load:
+        raise LoadError("--first-load cannot be combined with --checkpoint/--resume: committed batches would sit without indexes")
+    buckets = bucket_grain if actuals_target == "buckets" else None
+    if buckets and (stream or checkpoint or incremental or first_load or partition):
+        raise LoadError(
+            "--actuals buckets replaces whole months from the full file in one transaction; it cannot be combined "
+            "with --stream, --checkpoint/--resume, --incremental, --first-load or --partition"
+        )
+
+    report = RunReport(input_path, tenant_name)
+    source_hash = file_sha256(input_path)
+    validator = InputValidator(reject_path or default_reject_path(input_path))
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            if not buckets:
+                ensure_actual_hours_table(cur, partition)
+                ensure_rollup_tables(cur)
+            elif not actual_hours_is_buckets(cur):
+                raise LoadError(
+                    "--actuals buckets needs the application's schema (EF migrations): actual_hours here is "
+                    "missing or is this loader's daily table"
+                )
+            ensure_load_watermark_table(cur)
+            ensure_employee_email_table(cur)
+            if checkpoint:
+                ensure_load_checkpoint_table(cur)
+            tenant_id = upsert_tenant(cur, tenant_name)
+
+            since = None
+            if incremental:
+                skip, since = resolve_since(cur, tenant_id, input_path, source_hash, lookback_days)
+                if skip:
+                    conn.rollback()
+                    return
+
+            if stream:
+                print(f"Streaming data from {input_path} in chunks of {chunk_rows} rows ...")
+                with report.phase("parse + stage actuals", cur) as ph:
+                    id_tenant = tenant_id if ids == "deterministic" else None
+                    models = stream_models(cur, input_path, chunk_rows, since, id_tenant, pipeline, validator)
+                    ph.rows = ph.inserted = models[-1]
+                    ph.skipped = validator.rejected
+                validator.summary()
+            else:
+                print(f"Reading data from {input_path} ...")
+                with report.phase("read") as ph:
+                    df = read_data(input_path, validator)
+                    ph.rows = len(df)
+                    ph.skipped = validator.rejected
+                validator.summary()
+                with report.phase("build_models", rows=len(df)):
+                    models = build_models(df, impl=build_impl, since=since)
+                del df
+                if ids == "deterministic":
+                    with report.phase("actual ids", rows=len(models[4])) as ph:
+                        models = (*models[:4], assign_actual_ids(models[4], tenant_id))
+                        ph.skipped = ph.rows - len(models[4])
+
+            if checkpoint:
+                write_load_checkpointed(
+                    cur, tenant_id, models, input_path, source_hash, bulk_mode, report, batch_rows, resume, partition,
+                    rollups, pipeline,
+                )
+            else:
+                write_load(
+                    cur, tenant_id, models, input_path, source_hash, bulk_mode, report,
+                    partition=partition, rollups=rollups, pipeline=pipeline, first_load=first_load,
+                    buckets=buckets,
+                )
+
+        conn.commit()
+        print("Data load complete.")
+        report.print_table()
+        if report_path:
+            write_report(report_path, report.as_dict())
+    except LoadError:
+        conn.rollback()
+        raise
+    except Exception as exc:
+        conn.rollback()
+        if checkpoint:
+            print(f"Error, rolled back the current batch: {exc}\nCommitted work is kept; re-run with --resume to continue.")
+        else:
+            print(f"Error, rolled back: {exc}")
+        raise
+    finally:
+        conn.close()
+
+
+def rebuild_all_rollups(tenant_names=None):
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            ensure_rollup_tables(cur)
+            if tenant_names:
+                cur.execute("SELECT id, name FROM tenants WHERE name = ANY(%s)", (tenant_names,))
+            else:
+                cur.execute("SELECT id, name FROM tenants WHERE id IN (SELECT DISTINCT tenant_id FROM actual_hours)")
+            for tenant_id, name in cur.fetchall():
+                weeks, months = refresh_rollups(cur, tenant_id, rebuild=True)
+                print(f"{name}: {weeks} user/WBS weeks, {months} project months")
+                conn.commit()
+    finally:
+        conn.close()
+
+
+def expand_inputs(specs) -> list:
+    """Files, directories (their supported files, non-recursive) and glob patterns, de-duplicated and sorted."""
+    found = set()
+    for spec in specs:
+        path = Path(spec)
+        if path.is_dir():
+            found.update(p for p in path.iterdir() if p.is_file() and p.suffix.lower() in INPUT_READERS)
+        elif path.exists():
+            found.add(path)
+        else:
+            found.update(Path(p) for p in glob.glob(spec) if Path(p).suffix.lower() in INPUT_READERS)
+    return sorted(found)
+
+
+def tenant_for(path: Path, tenant_map: dict) -> str:
+    """First tenant-map pattern matching the file name wins; otherwise the file stem is the tenant name."""
+    for pattern, tenant in tenant_map.items():
+        if fnmatch.fnmatch(path.name, pattern):
+            return tenant
+    return path.stem
+
+
+def parse_input(path: Path, build_impl: str, since, id_tenant=None):
+    """Process-pool entry point: read and build one file off the main process; returns (models, seconds)."""
+    started = time.perf_counter()
+    validator = InputValidator(default_reject_path(path))
+    models = build_models(read_data(path, validator), impl=build_impl, since=since)
+    validator.summary(path.name)
+    if id_tenant is not None:
+        models = (*models[:4], assign_actual_ids(models[4], id_tenant))
+    return models, time.perf_counter() - started
+
+
+@dataclass
+class FileResult:
+    path: Path
+    tenant: str
+    status: str = "pending"
+    rows: int = 0
+    seconds: float = 0.0
+    error: str = ""
+    report: RunReport = None
+
+
+def _load_tenant_files(pool, tenant_id, jobs, bulk_mode, admin_id, partition=None):
+    """Load one tenant's files in order, each in its own transaction on a pooled connection."""
+    for result, source_hash, parsed in jobs:
+        started = time.perf_counter()
+        result.report = RunReport(result.path, result.tenant)
+        try:
+            _load_tenant_file(pool, tenant_id, result, source_hash, parsed, bulk_mode, admin_id, partition)
+        finally:
+            result.seconds = time.perf_counter() - started
+
+
+def _load_tenant_file(pool, tenant_id, result, source_hash, parsed, bulk_mode, admin_id, partition):
+    try:
+        models, parse_seconds = parsed.result()
+    except Exception as exc:
+        result.status, result.error = "failed", f"parse: {exc}"
+        return
+    # Parsing ran in a worker process; record its time there, not the wait for it here.
+    result.report.phases.append(PhaseStats("parse + build_models", seconds=round(parse_seconds, 4)))
+    conn = pool.getconn()
+    try:
+        # New partitions are committed on their own so the DDL lock is not held for the whole file.
+        with conn.cursor() as cur:
+            ensure_actual_partitions(cur, *actual_span(models[2]), partition)
+        conn.commit()
+        with conn.cursor() as cur:
+            result.rows = write_load(
+                cur, tenant_id, models, result.path, source_hash, bulk_mode, result.report, admin_id, partition
+            )
+        conn.commit()
+        result.status = "loaded"
+    except Exception as exc:
+        conn.rollback()
+        result.status, result.error = "failed", str(exc).strip().splitlines()[0]
+    finally:
+        pool.putconn(conn)
+
+
+def load_many(
+    specs,
+    tenant_map: dict = None,
+    parse_workers: int = 2,
+    db_connections: int = 2,
+    bulk_mode: str = "copy",
+    build_impl: str = "vectorized",
+    incremental: bool = False,
+    lookback_days: int = 0,
+    report_path: Path = None,
+    partition: str = None,
+    ids: str = "random",
+) -> list:
+    """Load many exports into their tenants: parse in a process pool, write over at most db_connections connections."""
+    paths = expand_inputs(specs)
+    if not paths:
+        raise LoadError(f"No input files matched: {' '.join(map(str, specs))}")
+    results = [FileResult(path, tenant_for(path, tenant_map or {})) for path in paths]
+    if incremental:
+        # The watermark is one row per tenant: with several files it would only remember the last one's hash,
+        # and a lagging file's rows before another file's max_work_date would be filtered out unloaded.
+        shared = Counter(r.tenant for r in results)
+        shared = sorted(tenant for tenant, n in shared.items() if n > 1)
+        if shared:
+            raise LoadError(f"--incremental needs one input per tenant; several files map to: {', '.join(shared)}")
+    hashes = {r.path: file_sha256(r.path) for r in results}
+
+    # DDL, tenants and the shared admin user are handled once, serially, before any worker starts.
+    tenant_ids = {}
+    since = {}
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            ensure_actual_hours_table(cur, partition)
+            ensure_rollup_tables(cur)
+            ensure_load_watermark_table(cur)
+            ensure_employee_email_table(cur)
+            for r in results:
+                if r.tenant not in tenant_ids:
+                    tenant_ids[r.tenant] = upsert_tenant(cur, r.tenant)
+            admin_id = upsert_admin_user(cur, tenant_ids[results[0].tenant], dt.datetime.utcnow())
+            for r in results:
+                if incremental:
+                    skip, since[r.path] = resolve_since(cur, tenant_ids[r.tenant], r.path, hashes[r.path], lookback_days)
+                    if skip:
+                        r.status = "skipped"
+        conn.commit()
+    finally:
+        conn.close()
+
+    todo = [r for r in results if r.status == "pending"]
+    print(f"Loading {len(todo)} files into {len({r.tenant for r in todo})} tenants "
+          f"({parse_workers} parse workers, {db_connections} DB connections) ...")
+    started = time.perf_counter()
+    pool = open_pool(db_connections)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=parse_workers) as parsers, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=db_connections) as writers:
+            by_tenant = defaultdict(list)
+            for r in todo:
+                id_tenant = tenant_ids[r.tenant] if ids == "deterministic" else None
+                parsed = parsers.submit(parse_input, r.path, build_impl, since.get(r.path), id_tenant)
+                by_tenant[r.tenant].append((r, hashes[r.path], parsed))
+            loads = [
+                writers.submit(_load_tenant_files, pool, tenant_ids[tenant], jobs, bulk_mode, admin_id, partition)
+                for tenant, jobs in by_tenant.items()
+            ]
+            for future in loads:
+                future.result()
+    finally:
+        pool.closeall()
+
+    elapsed = time.perf_counter() - started
+    print_load_summary(results, elapsed)
+    if report_path:
+        write_report(
+            report_path,
+            {
+                "wall_seconds": round(elapsed, 4),
+                "peak_rss_mb": peak_rss_mb(),
+                "connection": asdict(CONNECTION_OPTIONS),
+                "files": [
+                    {
+                        "source": str(r.path),
+                        "tenant": r.tenant,
+                        "status": r.status,
+                        "error": r.error or None,
+                        "phases": [asdict(p) for p in r.report.phases] if r.report else [],
+                    }
+                    for r in results
+                ],
+            },
+        )
+    return results
+
+
+def print_load_summary(results, elapsed: float):
+    counts = Counter(r.status for r in results)
+    print(
+        f"Summary: {len(results)} files in {elapsed:.1f}s - "
+        + ", ".join(f"{counts[s]} {s}" for s in ("loaded", "skipped", "failed") if counts[s])
+    )
+    for r in results:
+        line = f"  {r.status:<8} {r.path.name} -> {r.tenant}: {r.rows} actual rows, {r.seconds:.1f}s"
+        print(f"{line} ({r.error})" if r.error else line)
+
+
+BENCH_SCALES = (100, 1000, 5000)
+
+
+def bench_scale(
+    employees: int,
+    workdir: Path,
+    days: int = 120,
+    fmt: str = ".parquet",
+    bulk_mode: str = "copy",
+    build_impl: str = "vectorized",
+    keep: bool = False,
+    seed: int = 0,
+    partition: str = None,
+    ids: str = "random",
+) -> dict:
+    """Generate, read, build and write one scale (rolled back unless keep); returns its report plus rows/s."""
+    tenant = f"Benchmark {employees}"
+    path = workdir / f"bench_{employees}x{days}{fmt}"
+    report = RunReport(path, tenant)
+    with report.phase("generate") as ph:
+        ph.rows = generate_input(path, employees=employees, days=days, seed=seed)
+    with report.phase("read", rows=ph.rows):
+        df = read_data(path)
+    with report.phase("build_models", rows=len(df)):
+        models = build_models(df, impl=build_impl)
+    del df
+
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            ensure_actual_hours_table(cur, partition)
+            ensure_rollup_tables(cur)
+            ensure_load_watermark_table(cur)
+            ensure_employee_email_table(cur)
+            conn.commit()
+            tenant_id = upsert_tenant(cur, tenant)
+            if ids == "deterministic":
+                with report.phase("actual ids", rows=len(models[4])):
+                    models = (*models[:4], assign_actual_ids(models[4], tenant_id))
+            write_load(cur, tenant_id, models, path, file_sha256(path), bulk_mode, report, partition=partition)
+        conn.commit() if keep else conn.rollback()
+    finally:
+        conn.close()
+
+    result = report.as_dict()
+    result.update(employees=employees, days=days, rows=ph.rows, file_mb=round(path.stat().st_size / 2**20, 2))
+    for p in result["phases"]:
+        p["rows_per_sec"] = round(p["rows"] / p["seconds"]) if p["seconds"] and p["rows"] else None
+    return result
+
+
+def run_benchmark(scales=BENCH_SCALES, workdir: Path = None, output: Path = None, **options) -> list:
+    """bench_scale for each employee count, each in its own process, then print and optionally save the results."""
+    with tempfile.TemporaryDirectory(prefix="aleut_bench_") as tmp:
+        workdir = workdir or Path(tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        results = []
+        for employees in scales:
+            print(f"--- benchmark: {employees} employees ---")
+            with concurrent.futures.ProcessPoolExecutor(max_workers=1) as worker:
+                results.append(worker.submit(bench_scale, employees, workdir, **options).result())
+    print_benchmark(results)
+    if output:
+        write_report(output, {"options": options, "connection": asdict(CONNECTION_OPTIONS), "scales": results})
+    return results
+
+
+STARTUP_REPEAT = 5
+
+
+def benchmark_startup(repeat: int = STARTUP_REPEAT, output: Path = None) -> list:
+    """`startup`: time cold starts of each command and list the heavy modules each one imports."""
+    import subprocess
+
+    script = Path(__file__).resolve()
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, (str(script.parent), os.environ.get("PYTHONPATH"))))}
+    cases = [("python (no script)", ["-c", "pass"]), ("--help", [str(script), "--help"])]
+    cases.append(("-m --help", ["-m", script.stem, "--help"]))
+    cases += [(f"{command} --help", [str(script), command, "--help"]) for command in COMMANDS]
+    results = []
+    print(f"{'command':<22} {'median ms':>10} {'best ms':>8}  heavy imports")
+    for label, argv in cases:
+        seconds = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            subprocess.run([sys.executable, *argv], env=env, stdout=subprocess.DEVNULL, check=True)
+            seconds.append(time.perf_counter() - started)
+        probe = subprocess.run(
+            [sys.executable, "-X", "importtime", *argv], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            text=True, check=True,
+        )
+        imported = {line.rsplit("|", 1)[-1].strip() for line in probe.stderr.splitlines() if line.startswith("import time:")}
+        seconds.sort()
+        result = {
+            "command": label,
+            "median_ms": round(seconds[len(seconds) // 2] * 1000, 1),
+            "best_ms": round(seconds[0] * 1000, 1),
+            # By package prefix: _LazyModule's importlib.import_module() of the package itself is not logged.
+            "heavy_imports": [m for m in HEAVY_MODULES if any(n == m or n.startswith(m + ".") for n in imported)],
+        }
+        results.append(result)
+        print(
+            f"{label:<22} {result['median_ms']:>10.1f} {result['best_ms']:>8.1f}  "
+            f"{', '.join(result['heavy_imports']) or '-'}"
+        )
+    if output:
+        write_report(output, {"python": sys.version.split()[0], "repeat": repeat, "results": results})
+    return results
+
+
+def print_benchmark(results):
+    phases = list(dict.fromkeys(p["phase"] for r in results for p in r["phases"]))
+    print(f"{'phase':<22}" + "".join(f"{r['employees']:>6} emp/{r['rows']:<10}" for r in results))
+    for name in phases:
+        cells = []
+        for r in results:
+            p = next((p for p in r["phases"] if p["phase"] == name), None)
+            rate = f"{p['rows_per_sec']:,}/s" if p and p["rows_per_sec"] else ""
+            cells.append(f"{p['seconds']:>7.2f}s {rate:<12}" if p else " " * 21)
+        print(f"{name:<22}" + "".join(cells))
+    print(f"{'peak RSS (MB)':<22}" + "".join(f"{r['peak_rss_mb'] or '':>9}{'':<12}" for r in results))
+
+
+COMMANDS = (
+    "load", "plan", "validate", "load-many", "convert", "generate", "bench", "startup", "freeze", "rollups",
+    "passwords", "export",
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Load Aleut Federal seed data from an Excel, CSV, Parquet or Arrow export.")
+    commands = parser.add_subparsers(dest="command", metavar="{" + ",".join(COMMANDS) + "}")
+
+    load = commands.add_parser("load", help="Load an export into the database (default when no command is given)")
+    load.add_argument(
+        "--input",
+        "--excel-path",
+        dest="input_path",
+        type=Path,
+        default=None,
+        help=f"Path to the export: {', '.join(INPUT_READERS)} (default: myScheduling Load.xlsx)",
+    )
+    load.add_argument(
+        "--bulk-mode",
+        choices=BULK_MODES,
+        default="insert",
+        help="How actual hours are written: multi-row INSERT (default) or COPY into a staging table plus one merge; "
+        "--stream always uses COPY",
+    )
+    load.add_argument(
+        "--build-impl",
+        choices=tuple(BUILD_IMPLS),
+        default="vectorized",
+        help="build_models implementation: pandas groupby (default) or the row-by-row reference loop",
+    )
+    load.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only load rows dated on or after the tenant's watermark date; skip entirely if the file hash is unchanged",
+    )
+    load.add_argument(
+        "--lookback-days",
+        type=int,
+        default=0,
+        help="With --incremental, also re-read this many days before the watermark to pick up late corrections",
+    )
+    load.add_argument(
+        "--check-parity",
+        action="store_true",
+        help="Compare both build_models implementations on generated data (and on --input if given) and exit",
+    )
+    load.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read the input in chunks and COPY actuals to a staging table as they are parsed (bounded memory)",
+    )
+    load.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=STREAM_CHUNK_ROWS,
+        help=f"Rows per chunk in --stream mode (default: {STREAM_CHUNK_ROWS})",
+    )
+    load.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Prepare the next batch on a background thread while the database writes the current one; "
+        "with --stream, parsing overlaps staging",
+    )
+    load.add_argument(
+        "--reject-file",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="CSV for rows failing validation, as read plus a Reject_Reason column; valid rows still load "
+        "(default: <input stem>.rejects.csv beside the input, written only when rows are rejected)",
+    )
+    load.add_argument(
+        "--actuals",
+        dest="actuals_target",
+        choices=ACTUALS_TARGETS,
+        default="daily",
+        help="daily: this loader's daily actual_hours table (default); buckets: the application's ActualHours "
+        "period buckets, per role assignment, under one ForecastImportExport record (needs the EF schema)",
+    )
+    load.add_argument(
+        "--bucket-grain",
+        choices=BUCKET_GRAINS,
+        default="month",
+        help="Bucket size for --actuals buckets: month (Week empty) or week of month (default: month)",
+    )
+    load.add_argument(
+        "--first-load",
+        action="store_true",
+        help="If actual_hours is empty, load it without its secondary indexes (duplicates dropped in memory) "
+        "and rebuild them afterwards",
+    )
+    load.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Commit after each phase and every --batch-rows actual rows, recording progress in seed_load_checkpoints",
+    )
+    load.add_argument(
+        "--batch-rows",
+        type=int,
+        default=CHECKPOINT_BATCH_ROWS,
+        help=f"Actual rows per committed batch with --checkpoint (default: {CHECKPOINT_BATCH_ROWS})",
+    )
+    load.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue a failed --checkpoint load of the same file after its last committed batch (implies --checkpoint)",
+    )
+    add_partition_argument(load)
+    add_ids_argument(load)
+    add_connection_arguments(load)
+    load.add_argument(
+        "--skip-rollups",
+        action="store_true",
+        help="Do not refresh the actual_hours_user_wbs_week / actual_hours_project_month rollups "
+        "(run `rollups` afterwards to rebuild them)",
+    )
+    load.add_argument(
+        "--plan",
+        action="store_true",
+        help="Dry run: report the inserts, updates and no-ops per entity the load would make, without writing",
+    )
+    add_report_arguments(load)
+
+    plan = commands.add_parser("plan", help="Dry run: report what `load` would insert, update or leave alone")
+    plan.add_argument("--input", "--excel-path", dest="input_path", type=Path, default=None, help="Path to the export")
+    plan.add_argument("--build-impl", choices=tuple(BUILD_IMPLS), default="vectorized")
+    plan.add_argument("--incremental", action="store_true", help="Plan an --incremental load")
+    plan.add_argument("--lookback-days", type=int, default=0)
+    add_ids_argument(plan)
+    add_connection_arguments(plan)
+    add_report_arguments(plan)
+
+    validate = commands.add_parser(
+        "validate", help="Check an export for bad rows without a database; exits 1 when rows would be rejected"
+    )
+    validate.add_argument("input_path", type=Path, help="Path to the export")
+    validate.add_argument(
+        "--reject-file", type=Path, default=None, metavar="PATH", help="Where rejected rows go (default: <input stem>.rejects.csv)"
+    )
+    validate.add_argument("--stream", action="store_true", help="Read in chunks of --chunk-rows (bounded memory)")
+    validate.add_argument("--chunk-rows", type=int, default=STREAM_CHUNK_ROWS)
+
+    many = commands.add_parser("load-many", help="Load several exports, one tenant per file, in parallel")
+    many.add_argument("inputs", nargs="+", help="Files, directories or glob patterns of exports")
+    many.add_argument(
+        "--tenant-map",
+        type=Path,
+        default=None,
+        help='JSON object of file-name glob -> tenant name, e.g. {"*_BU1.*": "Aleut Federal"}; '
+        "unmatched files use their file stem as the tenant name",
+    )
+    many.add_argument("--parse-workers", type=int, default=2, help="Processes parsing files (default: 2)")
+    many.add_argument(
+        "--db-connections",
+        type=int,
+        default=2,
+        help="Upper bound on concurrent Postgres connections/tenant loads (default: 2)",
+    )
+    many.add_argument("--bulk-mode", choices=BULK_MODES, default="copy", help="How actual hours are written (default: copy)")
+    many.add_argument("--build-impl", choices=tuple(BUILD_IMPLS), default="vectorized")
+    many.add_argument("--incremental", action="store_true", help="Per-tenant watermark loading, as for `load` (one input per tenant)")
+    many.add_argument("--lookback-days", type=int, default=0)
+    add_partition_argument(many)
+    add_ids_argument(many)
+    add_connection_arguments(many)
+    add_report_arguments(many)
+
+    convert = commands.add_parser("convert", help="Cache an export as Parquet/Arrow so repeated loads skip the Excel parse")
+    convert.add_argument("source", type=Path, help="Export to convert (usually the .xlsx)")
+    convert.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Destination .parquet or .arrow/.feather file (default: source with a .parquet suffix)",
+    )
+    convert.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=STREAM_CHUNK_ROWS,
+        help=f"Row group / record batch size, which is also the unit --stream reads (default: {STREAM_CHUNK_ROWS})",
+    )
+    convert.add_argument(
+        "--reject-file", type=Path, default=None, metavar="PATH", help="Where rejected rows go (default: <source stem>.rejects.csv)"
+    )
+
+    generate = commands.add_parser("generate", help="Write a synthetic export with the columns read_data expects")
+    generate.add_argument("output", type=Path, help=f"Destination file: {', '.join(INPUT_READERS)}")
+    add_shape_arguments(generate)
+    generate.add_argument("--projects", type=int, default=None, help="Programs (default: one per 20 employees)")
+    generate.add_argument("--wbs-depth", type=int, default=2, help="WBS levels below the program (default: 2)")
+    generate.add_argument("--manager-shape", choices=MANAGER_SHAPES, default="random", help="Shape of the manager tree")
+    generate.add_argument("--start", type=dt.date.fromisoformat, default=dt.date(2024, 1, 1), help="First work date")
+
+    bench = commands.add_parser("bench", help="Time read/build/write phases at several generated scales")
+    bench.add_argument(
+        "--scales",
+        type=lambda v: [int(n) for n in v.split(",")],
+        default=list(BENCH_SCALES),
+        help=f"Comma-separated employee counts (default: {','.join(map(str, BENCH_SCALES))})",
+    )
+    bench.add_argument("--days", type=int, default=120, help="Calendar days of timesheets per employee (default: 120)")
+    bench.add_argument("--seed", type=int, default=0)
+    bench.add_argument("--format", choices=tuple(INPUT_READERS), default=".parquet", help="Generated file format")
+    bench.add_argument("--bulk-mode", choices=BULK_MODES, default="copy")
+    bench.add_argument("--build-impl", choices=tuple(BUILD_IMPLS), default="vectorized")
+    add_partition_argument(bench)
+    add_ids_argument(bench)
+    add_connection_arguments(bench)
+    bench.add_argument("--keep", action="store_true", help="Commit the benchmark tenants instead of rolling back")
+    bench.add_argument("--workdir", type=Path, default=None, help="Keep generated files here (default: a temp dir)")
+    bench.add_argument("--output", type=Path, default=None, metavar="PATH", help="Write the results as JSON")
+
+    startup = commands.add_parser("startup", help="Time the CLI's cold start per command and list heavy imports")
+    startup.add_argument(
+        "--repeat", type=int, default=STARTUP_REPEAT, help=f"Runs per command (default: {STARTUP_REPEAT})"
+    )
+    startup.add_argument("--output", type=Path, default=None, metavar="PATH", help="Write the results as JSON")
+
+    freeze = commands.add_parser("freeze", help="Make closed periods of a partitioned actual_hours read-only")
+    freeze.add_argument(
+        "--before",
+        type=dt.date.fromisoformat,
+        required=True,
+        help="Freeze every partition whose range ends on or before this date (YYYY-MM-DD)",
+    )
+    freeze.add_argument("--thaw", action="store_true", help="Make those partitions writable again instead")
+
+    rollup = commands.add_parser("rollups", help="Rebuild the reporting rollups from actual_hours")
+    rollup.add_argument("--tenant", action="append", default=None, help="Tenant name (repeatable; default: all tenants)")
+
+    passwords = commands.add_parser(
+        "passwords", help="Set an initial bcrypt password for every user the loader created that has none yet"
+    )
+    passwords.add_argument("--tenant", action="append", default=None, help=f"Tenant name (repeatable; default: {TENANT_NAME})")
+    passwords.add_argument(
+        "--password", default=EMPLOYEE_PASSWORD, help="Initial password (default: the EMPLOYEE_PASSWORD constant)"
+    )
+    passwords.add_argument(
+        "--rounds", type=int, default=BCRYPT_ROUNDS, help=f"bcrypt work factor, 4-31 (default: {BCRYPT_ROUNDS})"
+    )
+    passwords.add_argument(
+        "--workers", type=int, default=None, help="Hashing processes (default: one per CPU)"
+    )
+    passwords.add_argument(
+        "--batch-users",
+        type=int,
+        default=PASSWORD_BATCH_USERS,
+        help=f"Users hashed and committed per batch (default: {PASSWORD_BATCH_USERS})",
+    )
+
+    export = commands.add_parser("export", help="Snapshot a tenant's loaded tables to Parquet for offline analysis")
+    export.add_argument("output", type=Path, help="Directory to write (must be new or empty)")
+    export.add_argument("--tenant", default=TENANT_NAME, help=f"Tenant name (default: {TENANT_NAME})")
+    export.add_argument(
+        "--partition",
+        choices=EXPORT_PARTITIONS,
+        default="month",
+        help="Split assignments and actual_hours into year=/month= directories (default: month)",
+    )
+    export.add_argument(
+        "--batch-rows",
+        type=int,
+        default=EXPORT_BATCH_ROWS,
+        help=f"Rows fetched and written per row group; bounds memory (default: {EXPORT_BATCH_ROWS})",
+    )
+    add_connection_arguments(export)
+    return parser
+
+
+def add_partition_argument(parser):
+    parser.add_argument(
+        "--partition",
+        choices=PARTITION_GRAINS,
+        default=None,
+        help="Create actual_hours range-partitioned by work_date (only when the table does not exist yet); "
+        "partitions for the input's dates are added automatically",
+    )
+
+
+def add_ids_argument(parser):
+    parser.add_argument(
+        "--ids",
+        choices=ID_MODES,
+        default="random",
+        help="actual_hours ids: random UUIDs (default) or UUIDv5 of the row's natural key, with duplicate "
+        "rows dropped in memory before loading; re-runs then also match rows with no pay type",
+    )
+
+
+def add_shape_arguments(parser):
+    parser.add_argument("--employees", type=int, default=300, help="Employees to generate (default: 300)")
+    parser.add_argument("--days", type=int, default=60, help="Calendar days of timesheets (default: 60)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same file")
+
+
+def add_connection_arguments(parser):
+    tuning = parser.add_argument_group("connection tuning (each can be switched off to measure it)")
+    tuning.add_argument(
+        "--no-session-tuning",
+        dest="session_tuning",
+        action="store_false",
+        help="Keep the server's synchronous_commit and work_mem instead of the load settings",
+    )
+    tuning.add_argument(
+        "--work-mem",
+        default=ConnectionOptions.work_mem,
+        help=f"work_mem for the load session (default: {ConnectionOptions.work_mem})",
+    )
+    tuning.add_argument(
+        "--no-prepare", dest="prepared", action="store_false", help="Send the tenant, watermark and checkpoint statements unprepared (the bulk upserts never are)"
+    )
+    tuning.add_argument(
+        "--no-local-socket",
+        dest="local_socket",
+        action="store_false",
+        help="Connect to a localhost server over TCP even when its Unix socket is available",
+    )
+
+
+def add_report_arguments(parser):
+    parser.add_argument(
+        "--report",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Write per-phase timings, row counts (inserted/updated/skipped), round trips and peak RSS as JSON",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Run under cProfile and dump stats to PATH (inspect with `python -m pstats PATH`)",
+    )
+
+
+def profiled(path: Path, fn, *args, **kwargs):
+    """Call fn, under cProfile when path is set, dumping the stats even if the load fails."""
+    if path is None:
+        return fn(*args, **kwargs)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args, **kwargs)
+    finally:
+        profiler.dump_stats(path)
+        print(f"Profile written to {path}")
+
+
+def cli(argv=None):
+    try:
+        run_cli(argv)
+    except LoadError as exc:
+        sys.exit(str(exc))
+
+
+def run_cli(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Bare options keep working as before: `load_aleut_seed.py --excel-path X` means `load --excel-path X`.
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv.insert(0, "load")
+    args = build_parser().parse_args(argv)
+    if hasattr(args, "session_tuning"):
+        CONNECTION_OPTIONS.session_tuning = args.session_tuning
+        CONNECTION_OPTIONS.work_mem = args.work_mem
+        CONNECTION_OPTIONS.prepared = args.prepared
+        CONNECTION_OPTIONS.local_socket = args.local_socket
+
+    if args.command == "convert":
+        if not args.source.exists():
+            sys.exit(f"Input file not found: {args.source}")
+        convert_input(args.source, args.output or args.source.with_suffix(".parquet"), args.chunk_rows, args.reject_file)
+        return
+
+    if args.command == "freeze":
+        conn = connect()
+        try:
+            with conn.cursor() as cur:
+                freeze_actual_partitions(cur, args.before, thaw=args.thaw)
+            conn.commit()
+        finally:
+            conn.close()
+        return
+
+    if args.command == "rollups":
+        rebuild_all_rollups(args.tenant)
+        return
+
+    if args.command == "passwords":
+        if not 4 <= args.rounds <= 31:
+            sys.exit("--rounds must be between 4 and 31")
+        seed_passwords(args.tenant, args.password, args.rounds, args.workers, args.batch_users)
+        return
+
+    if args.command == "export":
+        export_tenant(args.tenant, args.output, args.partition, args.batch_rows)
+        return
+
+    if args.command == "validate":
+        if not args.input_path.exists():
+            sys.exit(f"Input file not found: {args.input_path}")
+        validator = validate_input(args.input_path, args.reject_file, args.stream, args.chunk_rows)
+        sys.exit(1 if validator.rejected else 0)
+
+    if args.command == "startup":
+        benchmark_startup(args.repeat, args.output)
+        return
+
+    if args.command == "generate":
+        generate_input(
+            args.output,
+            employees=args.employees,
+            days=args.days,
+            seed=args.seed,
+            projects=args.projects,
+            wbs_depth=args.wbs_depth,
+            manager_shape=args.manager_shape,
+            start=args.start,
+        )
+        return
+
+    if args.command == "bench":
+        run_benchmark(
+            args.scales,
+            workdir=args.workdir,
+            output=args.output,
+            days=args.days,
+            fmt=args.format,
+            bulk_mode=args.bulk_mode,
+            build_impl=args.build_impl,
+            keep=args.keep,
+            seed=args.seed,
+            partition=args.partition,
+            ids=args.ids,
+        )
+        return
+
+    if args.command == "load-many":
+        tenant_map = json.loads(args.tenant_map.read_text(encoding="utf-8")) if args.tenant_map else {}
+        results = profiled(
+            args.profile,
+            load_many,
+            args.inputs,
+            tenant_map=tenant_map,
+            parse_workers=args.parse_workers,
+            db_connections=args.db_connections,
+            bulk_mode=args.bulk_mode,
+            build_impl=args.build_impl,
+            incremental=args.incremental,
+            lookback_days=args.lookback_days,
+            report_path=args.report,
+            partition=args.partition,
+            ids=args.ids,
+        )
+        sys.exit(1 if any(r.status == "failed" for r in results) else 0)
+
+    if args.command == "load" and args.check_parity:
+        ok = check_build_parity()
+        if args.input_path:
+            ok = check_build_parity(read_data(args.input_path)) and ok
+        sys.exit(0 if ok else 1)
+    if args.command == "load" and args.plan:
+        # The plan models the default daily write path; these would make the real run take another one.
+        other_paths = [
+            flag for flag, used in (
+                ("--stream", args.stream),
+                ("--pipeline", args.pipeline),
+                ("--bulk-mode copy", args.bulk_mode != "insert"),
+                ("--partition", args.partition),
+                ("--actuals buckets", args.actuals_target == "buckets"),
+                ("--checkpoint/--resume", args.checkpoint or args.resume),
+                ("--first-load", args.first_load),
+            ) if used
+        ]
+        if other_paths:
+            sys.exit(f"--plan cannot be combined with {', '.join(other_paths)}: it only models the default write path")
+    if args.command == "plan" or args.plan:
+        profiled(
+            args.profile,
+            run_plan,
+            args.input_path or DEFAULT_EXCEL,
+            build_impl=args.build_impl,
+            incremental=args.incremental,
+            lookback_days=args.lookback_days,
+            ids=args.ids,
+            report_path=args.report,
+        )
+        return
+    profiled(
+        args.profile,
+        main,
+        args.input_path or DEFAULT_EXCEL,
+        bulk_mode=args.bulk_mode,
+        build_impl=args.build_impl,
+        stream=args.stream,
+        chunk_rows=args.chunk_rows,
+        incremental=args.incremental,
+        lookback_days=args.lookback_days,
+        report_path=args.report,
+        checkpoint=args.checkpoint,
+        batch_rows=args.batch_rows,
+        resume=args.resume,
+        partition=args.partition,
+        rollups=not args.skip_rollups,
+        ids=args.ids,
+        pipeline=args.pipeline,
+        first_load=args.first_load,
+        actuals_target=args.actuals_target,
+        bucket_grain=args.bucket_grain,
+        reject_path=args.reject_file,
+    )
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Load Aleut Federal seed data from Excel.")
-    parser.add_argument("--excel-path", type=Path, default=DEFAULT_EXCEL, help="Path to Excel file (default: myScheduling Load.xlsx)")
-    args = parser.parse_args()
-    main(args.excel_path)
+    cli()
@@ -0,0 +1,235 @@
+"""Database-free checks for scripts/load_aleut_seed.py: build_models parity and the pure helpers.
+
+Run with: python -m pytest scripts/tests
+"""
+import datetime as dt
+import sys
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import load_aleut_seed as seed  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "employees, days, manager_shape, wbs_depth, data_seed",
+    [
+        (50, 60, "random", 2, 0),
+        (300, 30, "balanced", 1, 1),
+        (120, 45, "flat", 0, 2),
+        (400, 20, "deep", 3, 3),
+        (80, 120, "random", 2, 4),  # spans several months, so assignments carry several monthly buckets
+    ],
+)
+def test_vectorized_build_matches_reference(employees, days, manager_shape, wbs_depth, data_seed):
+    frame = seed.synthetic_frame(
+        employees=employees, days=days, seed=data_seed, manager_shape=manager_shape, wbs_depth=wbs_depth
+    )
+    expected = seed.build_models_reference(frame)
+    actual = seed.build_models_vectorized(frame)
+    assert seed.compare_build_outputs(expected, actual) == []
+
+
+def _employees(links):
+    return {emp_id: {"manager_emp_id": manager} for emp_id, manager in links.items()}
+
+
+def test_manager_hierarchy_breaks_cycles_at_lowest_id():
+    manager_of, dangling, cycles = seed.resolve_manager_hierarchy(
+        _employees({1: 2, 2: 3, 3: 1, 4: 1, 5: 99, 6: None})
+    )
+    assert [sorted(cycle) for cycle in cycles] == [[1, 2, 3]]
+    assert manager_of == {1: None, 2: 3, 3: 1, 4: 1, 6: None}
+    assert dangling == {5: 99}
+
+
+def test_manager_hierarchy_self_manager_is_a_cycle():
+    manager_of, dangling, cycles = seed.resolve_manager_hierarchy(_employees({7: 7, 8: 7}))
+    assert cycles == [[7]]
+    assert manager_of == {7: None, 8: 7}
+    assert dangling == {}
+
+
+def test_manager_hierarchy_without_cycles_is_unchanged():
+    links = {1: None, 2: 1, 3: 1, 4: 2}
+    manager_of, dangling, cycles = seed.resolve_manager_hierarchy(_employees(links))
+    assert (manager_of, dangling, cycles) == (links, {}, [])
+
+
+@pytest.mark.parametrize("chunk_rows, since", [(1000, None), (4321, None), (2500, dt.date(2024, 2, 15))])
+def test_streaming_builder_matches_build_models(chunk_rows, since):
+    frame = seed.synthetic_frame(employees=120, days=70, seed=5, manager_shape="balanced")
+    builder = seed.StreamingModelBuilder(since=since)
+    actuals = pd.concat(
+        [builder.add(frame.iloc[start:start + chunk_rows]) for start in range(0, len(frame), chunk_rows)],
+        ignore_index=True,
+    )
+    streamed = (*builder.results(), actuals)
+    assert seed.compare_build_outputs(seed.build_models_vectorized(frame, since=since), streamed) == []
+
+
+def test_uuid5_strings_match_uuid5():
+    namespace = uuid.UUID("7b1d4c2e-5a3f-4e8b-9c6d-1f2a3b4c5d6e")
+    names = ["", "1000|00012.001|2024-01-02|8.0|REG|Regular", "Łukasz Nowak", "x" * 500]
+    assert seed.uuid5_strings(namespace, names) == [str(uuid.uuid5(namespace, name)) for name in names]
+
+
+def test_email_index_namesakes_get_their_id():
+    emails = seed.EmailIndex()
+    assert emails.resolve(1, "Ann", "Lee") == "ann.lee@aleutfederal.com"
+    assert emails.resolve(2, "Ann", "Lee") == "ann.lee.2@aleutfederal.com"
+    assert emails.resolve(1, "Ann", "Lee") == "ann.lee@aleutfederal.com"
+    assert emails.new == {1: "ann.lee@aleutfederal.com", 2: "ann.lee.2@aleutfederal.com"}
+
+
+def test_email_index_keeps_earlier_claims():
+    emails = seed.EmailIndex(claims=[(2, "ann.lee@aleutfederal.com")])
+    # Employee 1 shows up first in this file, but employee 2 got first.last@ in an earlier load.
+    assert emails.resolve(1, "Ann", "Lee") == "ann.lee.1@aleutfederal.com"
+    assert emails.resolve(2, "Ann", "Lee", "ann.lee.2@aleutfederal.com") == "ann.lee@aleutfederal.com"
+    assert emails.new == {1: "ann.lee.1@aleutfederal.com"}
+
+
+def test_email_index_avoids_taken_emails():
+    emails = seed.EmailIndex(taken=["ann.lee@aleutfederal.com", "ann.lee.1@aleutfederal.com"])
+    # first.last@ and first.last.<id>@ both belong to another tenant or user, so a counter is added.
+    assert emails.resolve(1, "Ann", "Lee") == "ann.lee.1.2@aleutfederal.com"
+    assert emails.resolve(2, "Bo", "Ng") == "bo.ng@aleutfederal.com"
+
+
+def _actuals(rows):
+    """Actual rows from (emp_id, wbs_code, work_date, hours, pay_type) tuples."""
+    return pd.DataFrame(
+        [
+            {
+                "emp_id": emp, "project_code": wbs.split(".")[0], "wbs_code": wbs, "project_name": "P",
+                "work_date": day, "hours": hours, "pay_type": pay, "pay_type_name": pay and "Regular",
+                "business_unit": "BU",
+            }
+            for emp, wbs, day, hours, pay in rows
+        ],
+        columns=seed.ACTUAL_FRAME_COLUMNS,
+    )
+
+
+def _bucket_table(buckets):
+    return sorted(
+        (row.emp_id, row.wbs_code, row.year, row.month, row.week, row.hours, row.entries)
+        for row in buckets.itertuples()
+    )
+
+
+def test_period_buckets():
+    actuals = _actuals([
+        (1, "A.01", dt.date(2024, 1, 2), 8.0, "REG"),
+        (1, "A.01", dt.date(2024, 1, 9), 7.556, "REG"),  # rounded per row, as the daily table stores it
+        (1, "A.01", dt.date(2024, 1, 9), 7.556, "REG"),  # the unique index would reject this duplicate
+        (1, "A.01", dt.date(2024, 2, 1), 4.0, None),
+        (1, "A.01", dt.date(2024, 2, 1), 4.0, None),  # missing pay types are never duplicates
+        (2, "A.01", dt.date(2024, 1, 31), 6.0, "REG"),
+    ])
+    assert _bucket_table(seed.period_buckets(actuals)) == [
+        (1, "A.01", 2024, 1, None, 15.56, 2),
+        (1, "A.01", 2024, 2, None, 8.0, 2),
+        (2, "A.01", 2024, 1, None, 6.0, 1),
+    ]
+    assert _bucket_table(seed.period_buckets(actuals, "week")) == [
+        (1, "A.01", 2024, 1, 1, 8.0, 1),
+        (1, "A.01", 2024, 1, 2, 7.56, 1),
+        (1, "A.01", 2024, 2, 1, 8.0, 2),
+        (2, "A.01", 2024, 1, 5, 6.0, 1),
+    ]
+
+
+def _assignment(start, end, monthly):
+    return {"start": start, "end": end, "total_hours": sum(monthly.values()), "monthly": monthly}
+
+
+def test_allocation_periods():
+    jan, feb, mar = dt.date(2024, 1, 1), dt.date(2024, 2, 1), dt.date(2024, 3, 1)
+    # January 2024 has 23 weekdays, February 21 and March 21.
+    periods = seed.allocation_periods({
+        "steady": _assignment(jan, dt.date(2024, 2, 29), {jan: 184.0, feb: 168.0}),
+        "halved": _assignment(jan, dt.date(2024, 2, 29), {jan: 184.0, feb: 84.0}),
+        "gap": _assignment(jan, dt.date(2024, 3, 31), {jan: 184.0, mar: 168.0}),
+        "partial": _assignment(dt.date(2024, 1, 15), dt.date(2024, 1, 31), {jan: 52.0}),
+        "small drift": _assignment(jan, dt.date(2024, 2, 29), {jan: 184.0, feb: 134.4}),
+    })
+    assert periods["steady"] == [(jan, dt.date(2024, 2, 29), 100)]
+    assert periods["halved"] == [(jan, dt.date(2024, 1, 31), 100), (feb, dt.date(2024, 2, 29), 50)]
+    assert periods["gap"] == [(jan, dt.date(2024, 1, 31), 100), (mar, dt.date(2024, 3, 31), 100)]
+    assert periods["partial"] == [(dt.date(2024, 1, 15), dt.date(2024, 1, 31), 50)]  # 13 weekdays
+    assert periods["small drift"] == [(jan, dt.date(2024, 2, 29), 90)]  # 318.4h over 44 weekdays
+
+
+def test_allocation_periods_empty():
+    assert seed.allocation_periods({}) == {}
+
+
+def _input(rows):
+    """Input rows from (emp_id, name, hours_date, hours) tuples; the other columns are the same everywhere."""
+    return pd.DataFrame(
+        [
+            {
+                "Employee_Id": emp, "Employee_Name": name, "Manager_ID": None, "Active_Flag": "Y",
+                "Business_Unit": "BU", "Hire_date": "2020-01-01", "Termination_date": None, "Project_ID": "A.01",
+                "Project_Name": "P", "Hours_Date": day, "Entered_Hours": hours, "Pay_Type": "REG",
+                "Pay_Type_Name": "Regular",
+            }
+            for emp, name, day, hours in rows
+        ],
+        columns=seed.INPUT_COLUMNS,
+    )
+
+
+def test_input_validator_rejects_only_the_odd_name():
+    validator = seed.InputValidator()
+    kept = validator.check(_input([
+        (1, "Ann Lee", "2024-01-02", 8),  # a typo on the first row loses only that row
+        (1, "Ann Leee", "2024-01-03", 8),
+        (1, "Ann Leee", "2024-01-04", 8),
+        (2, "Bo Ng", "2024-01-02", 8),
+    ]))
+    assert kept["Hours_Date"].dt.day.tolist() == [3, 4, 2]
+    assert validator.rejected == 1
+    assert +validator.reasons == {"Employee_Name differs from the employee's other rows": 1}
+
+
+def test_input_validator_rejects_bad_hours():
+    validator = seed.InputValidator()
+    kept = validator.check(_input([
+        (1, "Ann Lee", "2024-01-02", -1),
+        (1, "Ann Lee", "2024-01-03", 25),
+        (1, "Ann Lee", "2024-01-04", "x"),
+        (1, "Ann Lee", "2024-01-05", 24),
+    ]))
+    assert kept["Entered_Hours"].tolist() == [24.0]
+    assert +validator.reasons == {"Entered_Hours is outside 0-24": 2, "Entered_Hours is not a number": 1}
+
+
+def test_input_validator_daily_total_carries_across_frames():
+    validator = seed.InputValidator()
+    first = validator.check(_input([(1, "Ann Lee", "2024-01-02", 10), (1, "Ann Lee", "2024-01-02", 10)]))
+    # Another 5 hours on the same day puts the total over 24; the whole group of the later frame goes.
+    second = validator.check(_input([(1, "Ann Lee", "2024-01-02", 3), (1, "Ann Lee", "2024-01-02", 2)]))
+    third = validator.check(_input([(1, "Ann Lee", "2024-01-02", 4), (1, "Ann Lee", "2024-01-03", 24)]))
+    assert (len(first), len(second), len(third)) == (2, 0, 2)
+    assert +validator.reasons == {"daily Entered_Hours total is over 24": 2}
+
+
+def test_input_validator_counts_drift_without_rejecting():
+    validator = seed.InputValidator()
+    frame = _input([(1, "Ann Lee", "2024-01-02", 8), (1, "Ann Lee", "2024-01-03", 8)])
+    frame.loc[1, "Business_Unit"] = "Other"
+    assert len(validator.check(frame)) == 2
+    assert validator.rejected == 0
+    assert validator.drift["Business_Unit"] == 1
+
+
+def test_input_validator_missing_column():
+    with pytest.raises(seed.LoadError, match="Pay_Type_Name"):
+        seed.InputValidator().check(_input([]).drop(columns="Pay_Type_Name"))